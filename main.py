@@ -1,22 +1,39 @@
+import time
+START_TIME = time.perf_counter()  # Açılış ölçümü buradan başlar
 import sys
 import os
+import re
 import json
+import heapq
+import sqlite3
+import unicodedata
 import random
-import requests
+import hashlib
+import itertools
+import threading
+import multiprocessing
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+from pathlib import Path
 import qtawesome as qta
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QLineEdit, QListWidget, QListWidgetItem, QSlider, QFrame,
+    QLabel, QLineEdit, QListWidget, QListWidgetItem, QListView, QSlider, QFrame,
     QStackedWidget, QGraphicsDropShadowEffect, QMessageBox, QMenu,
-    QAbstractItemView, QInputDialog, QSplitter
+    QAbstractItemView, QInputDialog, QSplitter, QFileDialog
 )
-from PyQt5.QtCore import Qt, QSize, QTimer, QThread, pyqtSignal, QPoint
-from PyQt5.QtGui import QColor, QPixmap, QIcon
+from PyQt5.QtCore import (
+    Qt, QSize, QTimer, QThread, QObject, pyqtSignal, QPoint, QEvent,
+    QAbstractListModel, QModelIndex, QMimeData, QBuffer, QIODevice
+)
+from PyQt5.QtGui import QColor, QBrush, QPixmap, QIcon, QImage, QImageReader
 
-import vlc
-import yt_dlp
 import PyQt5
+# vlc, yt_dlp ve requests ağır; ilk çalma / arama / indirmede yüklenir
+IMPORTS_DONE = time.perf_counter()
 
 
 # --- 1. AYARLAR ---
@@ -31,127 +48,2518 @@ if os.path.exists(vlc_path):
     except Exception:
         pass
 
+# Kullanıcı ayarları: settings.json içindeki anahtarlar varsayılanları ezer
+SETTINGS_FILE = "settings.json"
+DEFAULT_SETTINGS = {
+    'persist_interval_ms': 500,  # Kütüphane değişiklikleri bu aralıkta toplanıp yazılır
+    'thumb_workers': 6,          # Aynı anda en fazla kaç kapak resmi indirilsin
+    'thumb_memory_mb': 32,       # Bellekteki kapak önbelleği üst sınırı
+    'thumb_disk_mb': 200,        # Diskteki kapak önbelleği üst sınırı
+    'http_per_host': 8,          # Host başına açık tutulacak en fazla bağlantı
+    'http_connect_timeout': 5,
+    'http_read_timeout': 15,
+    'http2': False,              # httpx + h2 kuruluysa HTTP/2 kullan
+    'stream_cache_margin': 300,  # expire= zamanından bu kadar saniye önce yeniden çöz
+    'stream_cache_ttl': 3600,    # expire= olmayan adresler için geçerlilik süresi
+    'resolver_workers': 2,       # yt-dlp çözümleyici süreç sayısı
+    'search_page_size': 10,      # Arama sonuçları kaçar kaçar yüklensin
+    'search_cache_ttl': 6 * 3600,        # Bu süreden yeni sonuçlar taze sayılır
+    'search_cache_max_age': 7 * 86400,   # Bayat sonuçlar bu süreye kadar gösterilip yenilenir
+    'search_cache_entries': 300,
+    'live_search': False,        # Yazarken ara (Enter beklemeden)
+    'live_search_debounce_ms': 450,
+    'live_search_min_chars': 3,
+    'prefetch_queue': 2,         # Queue başından kaç şarkı önceden çözülsün
+    'prefetch_delay_ms': 1500,   # Çalma başladıktan sonra ön çözümlemeye kadar bekleme
+    'audio_cache_mb': 2048,      # Çevrimdışı ses önbelleği üst sınırı
+    'audio_cache_on_play': True, # Çalınan parçalar arka planda diske de kaydedilsin
+    'download_workers': 2,       # Aynı anda en fazla kaç parça indirilsin
+    'download_rate_kbps': 2048,  # Tüm indirmelerin toplam hız sınırı (KB/s, 0 = sınırsız)
+    'audio_quality': 'balanced', # 'high' (~160k opus), 'balanced' (128k m4a), 'low' (~50k, az veri)
+    'music_folders': [],         # Taranacak yerel müzik klasörleri
+    'scan_workers': 2,           # Etiket okuyan süreç sayısı
+    'crossfade_ms': 0,           # Parça geçişinde çapraz geçiş süresi (0 = boşluksuz geçiş)
+    'preload_seconds': 20,       # Sıradaki parça bitişe bu kadar kala açılıp tamponlansın
+    'startup_report': False,     # Açılış süresini evrelere bölüp yazdır (ya da --startup-report)
+}
+
+THUMB_CACHE_DIR = os.path.join("cache", "thumbs")
+AUDIO_CACHE_DIR = os.path.join("cache", "audio")
+THUMB_SIZE = (120, 90)           # Listelerdeki en büyük ikon boyutu; diskteki kopya bu boyutta
+LIST_THUMB_SIZE = (80, 60)
+COVER_SIZE = (60, 60)
+LIBRARY_DB_FILE = "library.db"
+STREAM_CACHE_FILE = "stream_cache.json"
+SEARCH_CACHE_FILE = "search_cache.json"
+DOWNLOADS_FILE = "downloads.json"
+DOWNLOAD_SPAN = 10 * 1024 * 1024  # İndirmelerde tek Range isteğinin boyu
+AUDIO_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.flac', '.ogg', '.opus', '.wav', '.wma', '.webm')
+
+
+# Yalnızca kullanıcının yazdığı anahtarlar (geri yazarken varsayılanlar sabitlenmesin)
+def load_user_settings():
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(load_user_settings())
+    return settings
+
+
+SETTINGS = load_settings()
+
+
+# Açılış süresi ölçümü: her evre süresiyle kaydedilir, pencere ilk kez
+# görünüp veri yüklenince tek satırda yazdırılır. Sonradan gelen evreler
+# (ör. ilk çalmada VLC) ayrı satır olarak eklenir.
+class StartupProfile:
+    def __init__(self, started, enabled=False):
+        self.started = started
+        self.enabled = enabled
+        self.phases = []
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t)
+
+    def add(self, name, seconds):
+        self.phases.append((name, seconds))
+        if self.reported and self.enabled:
+            print(f"[açılış] {name}: {seconds * 1000:.0f} ms (sonradan)", flush=True)
+
+    def report(self, shown_at):
+        if self.reported: return
+        self.reported = True
+        if not self.enabled: return
+        parts = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        total = (time.perf_counter() - self.started) * 1000
+        print(f"[açılış] {parts} | pencere {(shown_at - self.started) * 1000:.0f} ms, toplam {total:.0f} ms", flush=True)
+
+
+STARTUP = StartupProfile(START_TIME, SETTINGS['startup_report'] or '--startup-report' in sys.argv)
+STARTUP.add('içe aktarma', IMPORTS_DONE - START_TIME)
+
 
 # --- 2. ARKA PLAN İŞÇİLERİ ---
-class ImageLoader(QThread):
-    image_loaded = pyqtSignal(object, object)
+# Tüm resim/meta veri indirmeleri için ortak, keep-alive bağlantı havuzu.
+# urllib3/httpx havuzları thread-safe; pool_block ile host başına sınır kesin.
+class HttpClient:
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def __init__(self, per_host=8, connect_timeout=5, read_timeout=15, http2=False):
+        self.timeout = (connect_timeout, read_timeout)
+        self._client = None
+        self._session = None
+        if http2:
+            try:
+                import httpx
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=per_host * 4, max_keepalive_connections=per_host),
+                    timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                    headers={'User-Agent': self.USER_AGENT},
+                    follow_redirects=True,
+                )
+            except Exception:
+                # httpx ya da h2 yoksa HTTP/1.1 havuzuna düş
+                self._client = None
+        if self._client is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=per_host, pool_block=True)
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = self.USER_AGENT
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+
+    def get_bytes(self, url, headers=None):
+        if self._client is not None:
+            r = self._client.get(url, headers=headers)
+        else:
+            r = self._session.get(url, headers=headers, timeout=self.timeout)
+        r.raise_for_status()
+        return r.content
+
+    # Yanıtı parça parça f'ye yazar; on_chunk(n) False dönerse yarıda bırakır.
+    # offset > 0 ise Range ile kalınan yerden devam edilir; on_length toplam boyutu alır.
+    # Sunucu Range'i yok sayarsa dosya baştan yazılır ve on_restart çağrılır.
+    # span verilirse dosya bu büyüklükte Range dilimleriyle istenir (googlevideo
+    # yalnız-ses akışlarında tek parça uzun indirmeleri yavaşlatıp keser).
+    def download(self, url, f, offset=0, on_chunk=None, on_length=None, span=None, chunk_size=64 * 1024,
+                 on_restart=None):
+        while True:
+            headers = None
+            if offset or span:
+                end = offset + span - 1 if span else ''
+                headers = {'Range': f'bytes={offset}-{end}'}
+            if self._client is not None:
+                response = self._client.stream('GET', url, headers=headers)
+            else:
+                response = self._session.get(url, headers=headers, stream=True, timeout=self.timeout)
+            received = 0
+            with response as r:
+                r.raise_for_status()
+                total = None
+                if r.status_code == 206:
+                    size = r.headers.get('Content-Range', '').rpartition('/')[2]
+                    total = int(size) if size.isdigit() else None
+                else:
+                    if offset:
+                        # Sunucu Range'i yok saydı; dosya baştan yazılır
+                        f.seek(0)
+                        f.truncate()
+                        offset = 0
+                        if on_restart:
+                            on_restart()
+                    span = None
+                    length = r.headers.get('Content-Length')
+                    total = int(length) if length and length.isdigit() else None
+                if on_length and total:
+                    on_length(total)
+                chunks = r.iter_bytes(chunk_size) if self._client is not None else r.iter_content(chunk_size)
+                for chunk in chunks:
+                    f.write(chunk)
+                    received += len(chunk)
+                    if on_chunk and on_chunk(len(chunk)) is False:
+                        return False
+            offset += received
+            # Sunucu dilimi istenenden kısa gönderebilir; toplam biliniyorsa ona kadar sürülür
+            if total and offset >= total:
+                return True
+            if not received and (span or total):
+                raise OSError(f"Boş yanıt dilimi ({offset}/{total or '?'} bayt)")
+            if not total and (not span or received < span):
+                return True
+            if headers and r.status_code != 206:
+                raise OSError(f"Yanıt yarım kaldı, Range desteklenmiyor ({offset}/{total} bayt)")
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
+
+
+_http_client = None
+_http_lock = threading.Lock()
+
+
+def http_client():
+    global _http_client
+    with _http_lock:
+        if _http_client is None:
+            _http_client = HttpClient(
+                SETTINGS['http_per_host'],
+                SETTINGS['http_connect_timeout'],
+                SETTINGS['http_read_timeout'],
+                SETTINGS['http2'],
+            )
+        return _http_client
+
+
+# googlevideo yalnız-ses akışları tek parça uzun GET'leri yavaşlatıp keser
+# (bkz. HttpClient.download). VLC adresi tek GET ile açtığı için çalma da
+# 127.0.0.1 üzerindeki bu vekilden geçer: VLC'nin istediği konumdan itibaren
+# akış DOWNLOAD_SPAN'lık Range dilimleriyle çekilir, kopan dilim kalınan
+# yerden yeniden bağlanarak sürdürülür. VLC'nin kendi Range (sarma) istekleri
+# de karşılanır.
+class StreamProxy:
+    RETRIES = 3
+
+    def __init__(self, span=DOWNLOAD_SPAN):
+        self.span = span
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def url_for(self, stream_url):
+        with self._lock:
+            if self._server is None:
+                self._start()
+            token = hashlib.sha1(stream_url.encode('utf-8')).hexdigest()[:16]
+            self._urls[token] = stream_url
+            self._urls.move_to_end(token)
+            while len(self._urls) > 16:
+                self._urls.popitem(last=False)
+            return f"http://127.0.0.1:{self._server.server_address[1]}/{token}"
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _start(self):
+        import http.server
+        proxy = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                proxy._serve(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def _serve(self, handler):
+        with self._lock:
+            url = self._urls.get(handler.path.lstrip('/'))
+        if url is None:
+            handler.send_error(404)
+            return
+        m = re.match(r'bytes=(\d+)-', handler.headers.get('Range', ''))
+        out = _ProxyWriter(handler, int(m.group(1)) if m else 0, bool(m))
+        # Deneme sayısı yalnızca üst üste ilerlemeyen bağlantılar için tükenir
+        tries, sent = 0, out.sent
+        while tries < self.RETRIES:
+            try:
+                http_client().download(url, out, offset=out.start + out.sent, on_length=out.begin, span=self.span)
+                return
+            except Exception:
+                if out.closed:
+                    return  # VLC bağlantıyı kapattı (durdurma ya da sarma)
+            tries = 1 if out.sent > sent else tries + 1
+            sent = out.sent
+        if not out.started:
+            handler.send_error(502)
+
+
+class _ProxyWriter:
+    def __init__(self, handler, start, partial):
+        self.handler = handler
+        self.start = start
+        self.partial = partial
+        self.sent = 0
+        self.started = False
+        self.closed = False
+
+    def begin(self, total=None):
+        if self.started: return
+        self.started = True
+        h = self.handler
+        h.send_response(206 if self.partial else 200)
+        h.send_header('Accept-Ranges', 'bytes')
+        if total:
+            h.send_header('Content-Length', str(total - self.start))
+            if self.partial:
+                h.send_header('Content-Range', f'bytes {self.start}-{total - 1}/{total}')
+        h.end_headers()
+
+    def write(self, chunk):
+        self.begin()
+        try:
+            self.handler.wfile.write(chunk)
+        except OSError:
+            self.closed = True
+            raise
+        self.sent += len(chunk)
+
+    # Sunucu Range'i yok sayarsa baştan yazmak gerekir; gönderilen geri alınamaz
+    def seek(self, _pos):
+        raise OSError("Akış geri sarılamaz")
+
+    def truncate(self):
+        raise OSError("Akış geri sarılamaz")
+
+
+# Kapak önbelleği: bellekte boyutu küçültülmüş QImage'ler (LRU, bayt sınırlı),
+# diskte URL hash'iyle adlandırılmış JPEG dosyaları (boyut sınırlı, en eski silinir)
+class ThumbnailCache:
+    def __init__(self, directory, memory_bytes, disk_bytes):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._disk_used = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_items': len(self._memory),
+                'memory_bytes': self._memory_used,
+                'disk_bytes': self._disk_used or 0,
+            }
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".jpg")
+
+    # Bellekte her kapak gösterildiği boyutta tutulur: (url, (w, h))
+    def get_memory(self, url, size):
+        key = (url, size)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return image
+
+    def put_memory(self, url, size, image):
+        key = (url, size)
+        nbytes = image.byteCount()
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old.byteCount()
+            self._memory[key] = image
+            self._memory_used += nbytes
+            while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= evicted.byteCount()
+
+    # Aşağıdakiler işçi thread'lerinden çağrılır (disk G/Ç)
+    def load_disk(self, url):
+        path = self._path(url)
+        image = QImage(path) if os.path.exists(path) else QImage()
+        with self._lock:
+            if image.isNull():
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        try:
+            os.utime(path, None)  # LRU için son kullanım zamanı
+        except OSError:
+            pass
+        return image
+
+    def store_disk(self, url, image):
+        path = self._path(url)
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if not image.save(tmp, "JPG", 90):
+                return
+            os.replace(tmp, path)
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_used is None:
+                self._disk_used = self._scan_disk()
+            else:
+                self._disk_used += size
+            if self._disk_used > self.disk_bytes:
+                self._evict_disk()
+
+    def _scan_disk(self):
+        total = 0
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    total += entry.stat().st_size
+        except OSError:
+            pass
+        return total
+
+    def _evict_disk(self):
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.is_file()]
+        except OSError:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        # Sınırın %80'ine inene kadar en eski dosyaları sil
+        target = self.disk_bytes * 0.8
+        for e in entries:
+            if self._disk_used <= target:
+                break
+            try:
+                size = e.stat().st_size
+                os.remove(e.path)
+                self._disk_used -= size
+            except OSError:
+                pass
+
+
+# Çözülmüş akış adresleri: video URL -> googlevideo URL. Adresin içindeki
+# expire= parametresine göre geçerlilik tutulur, kapanışta diske yazılır.
+class StreamUrlCache:
+    def __init__(self, filename, margin=300, default_ttl=3600):
+        self.filename = filename
+        self.margin = margin
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        now = time.time()
+        if os.path.exists(filename):
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    for key, entry in json.load(f).items():
+                        if entry.get('expire', 0) - margin > now:
+                            self._entries[key] = entry
+            except Exception:
+                pass
+
+    def expiry_of(self, stream_url):
+        try:
+            parsed = urlparse(stream_url)
+            values = parse_qs(parsed.query).get('expire')
+            if values:
+                return int(values[0])
+            # Bazı googlevideo adresleri parametreleri yolda taşır: /expire/1700000000/
+            parts = parsed.path.split('/')
+            if 'expire' in parts:
+                return int(parts[parts.index('expire') + 1])
+        except (ValueError, IndexError):
+            pass
+        return int(time.time()) + self.default_ttl
+
+    def get(self, video_url):
+        with self._lock:
+            entry = self._entries.get(video_url)
+            if not entry:
+                return None
+            if entry['expire'] - self.margin <= time.time():
+                del self._entries[video_url]
+                self._dirty = True
+                return None
+            return entry['url']
+
+    def put(self, video_url, stream_url):
+        with self._lock:
+            self._entries[video_url] = {'url': stream_url, 'expire': self.expiry_of(stream_url)}
+            self._dirty = True
+
+    def invalidate(self, video_url):
+        with self._lock:
+            if self._entries.pop(video_url, None):
+                self._dirty = True
+
+    # Değişiklik varsa diske yazılacak kopyayı verir (yazımı PersistenceWorker yapar)
+    def snapshot(self):
+        with self._lock:
+            if not self._dirty:
+                return None
+            now = time.time()
+            self._dirty = False
+            return {k: dict(e) for k, e in self._entries.items() if e['expire'] - self.margin > now}
+
+
+# Çevrimdışı ses önbelleği: video anahtarı -> ses dosyası. Bayt bütçesi aşılınca
+# en uzun süredir çalınmayan dosyalar silinir (son kullanım = dosyanın mtime'ı).
+# İndirmeler .part dosyasına yapılır, bitince yerine taşınır.
+# GUI'nin çağırdığı touch/discard kaydı hemen günceller; dosya işi (utime,
+# silme) önbelleğin kendi tek işçili thread'inde yapılır.
+class AudioCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._io = ThreadPoolExecutor(max_workers=1)
+        self._files = OrderedDict()  # anahtar -> (yol, boyut), eskiden yeniye
+        self._used = 0
+        if os.path.isdir(directory):
+            entries = []
+            for e in os.scandir(directory):
+                if e.is_file() and not e.name.endswith('.part'):
+                    st = e.stat()
+                    entries.append((st.st_mtime, e.name, e.path, st.st_size))
+            for _, name, path, size in sorted(entries):
+                self._files[os.path.splitext(name)[0]] = (path, size)
+                self._used += size
+
+    def _key(self, video_url):
+        key = track_key(video_url)
+        if re.fullmatch(r'[\w-]+', key or ''):
+            return key
+        return hashlib.sha1(video_url.encode("utf-8")).hexdigest()
+
+    def has(self, video_url):
+        with self._lock:
+            return self._key(video_url) in self._files
+
+    # Dosya kayıtlıysa yolunu verir; yalnızca bellekten bakar, GUI'de çağrılabilir
+    def path(self, video_url):
+        with self._lock:
+            entry = self._files.get(self._key(video_url))
+        return entry[0] if entry else None
+
+    # Çalınmaya başlanan dosyayı en yeni kullanılan yapar; mtime arka planda
+    # yenilenir, dosya silinmişse kayıt düşürülür
+    def touch(self, video_url):
+        key = self._key(video_url)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is None:
+                return
+            self._files.move_to_end(key)
+        self._io.submit(self._touch_file, key, entry)
+
+    def _touch_file(self, key, entry):
+        try:
+            os.utime(entry[0], None)
+        except OSError:
+            with self._lock:
+                if self._files.get(key) == entry:
+                    del self._files[key]
+                    self._used -= entry[1]
+
+    def part_path(self, video_url, ext):
+        return os.path.join(self.directory, f"{self._key(video_url)}.{ext}.part")
+
+    def commit(self, video_url, part_path):
+        key = self._key(video_url)
+        path = part_path[:-len('.part')]
+        try:
+            os.replace(part_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            old = self._files.pop(key, None)
+            if old is not None:
+                self._used -= old[1]
+            self._files[key] = (path, size)
+            self._used += size
+            while self._used > self.max_bytes and len(self._files) > 1:
+                old_key, (old_path, old_size) = next(iter(self._files.items()))
+                if old_key == key:
+                    break
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    break  # Çalınıyor olabilir (Windows dosyayı kilitler)
+                del self._files[old_key]
+                self._used -= old_size
+
+    def discard(self, video_url):
+        with self._lock:
+            entry = self._files.pop(self._key(video_url), None)
+            if entry is None:
+                return
+            self._used -= entry[1]
+        self._io.submit(self._remove_file, entry[0])
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Akış adresindeki mime= parametresinden dosya uzantısı
+def stream_extension(stream_url):
+    try:
+        mime = parse_qs(urlparse(stream_url).query).get('mime', [''])[0]
+    except ValueError:
+        mime = ''
+    return {'audio/mp4': 'm4a', 'audio/webm': 'webm', 'video/webm': 'webm'}.get(mime, 'mp4')
+
+
+# Akış adresindeki clen= parametresi (googlevideo'da dosyanın tam boyu); yoksa 0
+def stream_length(stream_url):
+    try:
+        clen = parse_qs(urlparse(stream_url).query).get('clen', [''])[0]
+    except ValueError:
+        clen = ''
+    return int(clen) if clen.isdigit() else 0
+
+
+# Kütüphane deposu (SQLite). Sıralı listeler ('queue', 'favorites',
+# ('playlist', ad)) aynı şekildedir: (id, track_id, position). Konumlar REAL
+# olduğu için araya ekleme ve taşıma tek satır günceller; komşular arası
+# boşluk tükenirse yalnızca o liste yeniden numaralanır.
+LIBRARY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    thumbnail TEXT NOT NULL DEFAULT '',
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS favorites (
+    id INTEGER PRIMARY KEY,
+    track_id INTEGER NOT NULL UNIQUE REFERENCES tracks(id),
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS favorites_order ON favorites(position);
+CREATE TABLE IF NOT EXISTS playlists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS playlist_items (
+    id INTEGER PRIMARY KEY,
+    playlist_id INTEGER NOT NULL REFERENCES playlists(id) ON DELETE CASCADE,
+    track_id INTEGER NOT NULL REFERENCES tracks(id),
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS playlist_items_order ON playlist_items(playlist_id, position);
+CREATE TABLE IF NOT EXISTS queue (
+    id INTEGER PRIMARY KEY,
+    track_id INTEGER NOT NULL REFERENCES tracks(id),
+    position REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queue_order ON queue(position);
+CREATE TABLE IF NOT EXISTS local_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    track_id INTEGER NOT NULL REFERENCES tracks(id)
+);
+CREATE INDEX IF NOT EXISTS playlist_items_track ON playlist_items(track_id);
+CREATE INDEX IF NOT EXISTS queue_track ON queue(track_id);
+CREATE INDEX IF NOT EXISTS local_files_track ON local_files(track_id);
+"""
+
+# Kütüphane araması: tracks'in katlanmış (fold_text) başlık/sanatçı/albüm metni,
+# rowid = tracks.id. Trigger'lar yalnızca deponun bağlantısında kayıtlı
+# search_text() fonksiyonunu kullanır; sürüm değişince dizin yeniden kurulur.
+SEARCH_VERSION = '1'
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS track_search USING fts5(body, prefix='1 2 3');
+CREATE TRIGGER IF NOT EXISTS track_search_insert AFTER INSERT ON tracks BEGIN
+    INSERT INTO track_search (rowid, body) VALUES (new.id, search_text(new.title, new.extra));
+END;
+CREATE TRIGGER IF NOT EXISTS track_search_update AFTER UPDATE OF title, extra ON tracks
+WHEN old.title IS NOT new.title OR old.extra IS NOT new.extra BEGIN
+    UPDATE track_search SET body = search_text(new.title, new.extra) WHERE rowid = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS track_search_delete AFTER DELETE ON tracks BEGIN
+    DELETE FROM track_search WHERE rowid = old.id;
+END;
+"""
+
+# Yalnızca bir listede (favoriler, playlist, sıra, yerel) duran parçalar aranır
+LIBRARY_MEMBER = (
+    "(EXISTS (SELECT 1 FROM favorites WHERE track_id = t.id)"
+    " OR EXISTS (SELECT 1 FROM playlist_items WHERE track_id = t.id)"
+    " OR EXISTS (SELECT 1 FROM queue WHERE track_id = t.id)"
+    " OR EXISTS (SELECT 1 FROM local_files WHERE track_id = t.id))"
+)
+
+TRACK_COLUMNS = ('url', 'title', 'thumbnail')
+
+
+def search_text(title, extra):
+    parts = [title or '']
+    if extra:
+        try:
+            data = json.loads(extra)
+        except ValueError:
+            data = {}
+        parts += [str(data.get(k) or '') for k in ('uploader', 'album')]
+    return fold_text(' '.join(parts))
+
+
+# Her kelime önek olarak aranır: "sez ak" -> "sez"* AND "ak"*
+def search_match(query):
+    return ' '.join('"%s"*' % token.replace('"', '""') for token in fold_text(query).split())
+
+
+class LibraryStore:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(LIBRARY_SCHEMA)
+        self.conn.create_function('search_text', 2, search_text, deterministic=True)
+        self._init_search()
+
+    def _init_search(self):
+        try:
+            self.conn.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            return  # FTS5'siz SQLite: LibrarySearch tarayarak arar
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'search_version'").fetchone()
+        if row and row[0] == SEARCH_VERSION:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM track_search")
+            self.conn.execute("INSERT INTO track_search (rowid, body) SELECT id, search_text(title, extra) FROM tracks")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_version', ?)", (SEARCH_VERSION,))
+
+    def close(self):
+        self.conn.close()
+
+    # --- JSON'dan tek seferlik geçiş ---
+    def migrate_json(self, queue_file, favs_file, playlists_file):
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
 
-    def __init__(self, url, list_item):
+        def read(filename, default):
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception:
+                return default
+
+        with self.conn:
+            for data in read(queue_file, []):
+                self._append('queue', data)
+            for data in read(favs_file, []):
+                self._append('favorites', data)
+            for name, songs in read(playlists_file, {}).items():
+                self.create_playlist(name)
+                for data in songs:
+                    self._append(('playlist', name), data)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(int(time.time())),))
+
+    # --- Okuma ---
+    def load(self, seq):
+        table, where, params = self._scope(seq)
+        rows = self.conn.execute(
+            f"SELECT t.url, t.title, t.thumbnail, t.extra FROM {table} s JOIN tracks t ON t.id = s.track_id "
+            f"WHERE {where} ORDER BY s.position", params,
+        )
+        return [self._track_dict(row) for row in rows]
+
+    def load_playlists(self):
+        names = [r[0] for r in self.conn.execute("SELECT name FROM playlists ORDER BY position")]
+        return {name: self.load(('playlist', name)) for name in names}
+
+    # --- Yerel dosyalar ---
+    def local_index(self):
+        return {row[0]: (row[1], row[2]) for row in self.conn.execute("SELECT path, mtime, size FROM local_files")}
+
+    def load_local(self):
+        rows = self.conn.execute(
+            "SELECT t.url, t.title, t.thumbnail, t.extra FROM local_files l JOIN tracks t ON t.id = l.track_id "
+            "ORDER BY t.title COLLATE NOCASE"
+        )
+        return [self._track_dict(row) for row in rows]
+
+    # files: [(yol, mtime, boyut, parça)], removed: artık olmayan yollar
+    def apply_scan(self, files, removed):
+        with self.conn:
+            for path, mtime, size, data in files:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO local_files (path, mtime, size, track_id) VALUES (?, ?, ?, ?)",
+                    (path, mtime, size, self._track_id(data)),
+                )
+            self.conn.executemany("DELETE FROM local_files WHERE path = ?", [(p,) for p in removed])
+
+    # --- Yazma (transaction'ı çağıran yönetir, bkz. apply) ---
+    def apply(self, ops):
+        # Biriken işlemler tek transaction'da yazılır; geçersiz bir işlem
+        # (ör. silinmiş playlist) diğerlerini düşürmez
+        with self.conn:
+            for name, args in ops:
+                try:
+                    getattr(self, name)(*args)
+                except (KeyError, sqlite3.IntegrityError):
+                    pass
+
+    def insert(self, seq, index, data):
+        table, where, params = self._scope(seq)
+        track_id = self._track_id(data)
+        position = self._position_at(table, where, params, index)
+        self.conn.execute(
+            f"INSERT OR IGNORE INTO {table} ({self._scope_columns(seq)}track_id, position) "
+            f"VALUES ({'?, ' * len(params)}?, ?)", params + (track_id, position),
+        )
+
+    def remove(self, seq, index):
+        table, where, params = self._scope(seq)
+        row_id = self._row_id(table, where, params, index)
+        if row_id is not None:
+            self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+
+    def remove_track(self, seq, url):
+        table, where, params = self._scope(seq)
+        self.conn.execute(
+            f"DELETE FROM {table} WHERE {where} AND track_id = (SELECT id FROM tracks WHERE url = ?)",
+            params + (url,),
+        )
+
+    def move(self, seq, src, dst):
+        table, where, params = self._scope(seq)
+        row_id = self._row_id(table, where, params, src)
+        if row_id is None:
+            return
+        position = self._position_at(table, where, params, dst, exclude=row_id)
+        self.conn.execute(f"UPDATE {table} SET position = ? WHERE id = ?", (position, row_id))
+
+    def replace(self, seq, items):
+        table, where, params = self._scope(seq)
+        self.conn.execute(f"DELETE FROM {table} WHERE {where}", params)
+        for data in items:
+            self._append(seq, data)
+
+    def clear(self, seq):
+        table, where, params = self._scope(seq)
+        self.conn.execute(f"DELETE FROM {table} WHERE {where}", params)
+
+    def create_playlist(self, name):
+        row = self.conn.execute("SELECT COALESCE(MAX(position), 0) + 1 FROM playlists").fetchone()
+        self.conn.execute("INSERT OR IGNORE INTO playlists (name, position) VALUES (?, ?)", (name, row[0]))
+
+    def delete_playlist(self, name):
+        self.conn.execute("DELETE FROM playlists WHERE name = ?", (name,))
+
+    # --- İç yardımcılar ---
+    def _scope(self, seq):
+        if seq in ('queue', 'favorites'):
+            return seq, '1', ()
+        row = self.conn.execute("SELECT id FROM playlists WHERE name = ?", (seq[1],)).fetchone()
+        if row is None:
+            raise KeyError(seq[1])
+        return 'playlist_items', 'playlist_id = ?', (row[0],)
+
+    def _scope_columns(self, seq):
+        return '' if seq in ('queue', 'favorites') else 'playlist_id, '
+
+    def _append(self, seq, data):
+        if not data or not data.get('url'):
+            return
+        table, where, params = self._scope(seq)
+        track_id = self._track_id(data)
+        row = self.conn.execute(f"SELECT COALESCE(MAX(position), 0) + 1 FROM {table} WHERE {where}", params).fetchone()
+        self.conn.execute(
+            f"INSERT OR IGNORE INTO {table} ({self._scope_columns(seq)}track_id, position) "
+            f"VALUES ({'?, ' * len(params)}?, ?)", params + (track_id, row[0]),
+        )
+
+    def _track_id(self, data):
+        extra = {k: v for k, v in data.items() if k not in TRACK_COLUMNS}
+        values = (data.get('title', ''), data.get('thumbnail') or '', json.dumps(extra, ensure_ascii=False) if extra else None)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO tracks (url, title, thumbnail, extra) VALUES (?, ?, ?, ?)",
+            (data['url'],) + values,
+        )
+        self.conn.execute("UPDATE tracks SET title = ?, thumbnail = ?, extra = ? WHERE url = ?", values + (data['url'],))
+        return self.conn.execute("SELECT id FROM tracks WHERE url = ?", (data['url'],)).fetchone()[0]
+
+    @staticmethod
+    def _track_dict(row):
+        data = {'title': row[1], 'url': row[0], 'thumbnail': row[2]}
+        if row[3]:
+            data.update(json.loads(row[3]))
+        return data
+
+    def _row_id(self, table, where, params, index):
+        row = self.conn.execute(
+            f"SELECT id FROM {table} WHERE {where} ORDER BY position LIMIT 1 OFFSET ?", params + (index,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _position_at(self, table, where, params, index, exclude=None):
+        # index: satırın listeye girdikten sonraki sırası (taşınan satır hariç tutulur)
+        if exclude is not None:
+            where, params = f"{where} AND id != ?", params + (exclude,)
+        if index <= 0:
+            row = self.conn.execute(f"SELECT MIN(position) FROM {table} WHERE {where}", params).fetchone()
+            return 0.0 if row[0] is None else row[0] - 1
+        rows = self.conn.execute(
+            f"SELECT position FROM {table} WHERE {where} ORDER BY position LIMIT 2 OFFSET ?", params + (index - 1,)
+        ).fetchall()
+        if not rows:
+            row = self.conn.execute(f"SELECT MAX(position) FROM {table} WHERE {where}", params).fetchone()
+            return 0.0 if row[0] is None else row[0] + 1
+        if len(rows) == 1:
+            return rows[0][0] + 1
+        lo, hi = rows[0][0], rows[1][0]
+        if hi - lo < 1e-7:
+            self._renumber(table, where, params)
+            return self._position_at(table, where, params, index)
+        return (lo + hi) / 2
+
+    def _renumber(self, table, where, params):
+        ids = [r[0] for r in self.conn.execute(f"SELECT id FROM {table} WHERE {where} ORDER BY position", params)]
+        self.conn.executemany(f"UPDATE {table} SET position = ? WHERE id = ?", [(float(i), row_id) for i, row_id in enumerate(ids)])
+
+
+# GUI thread'inden arama için salt okunur bağlantı. WAL sayesinde yazıcıyı
+# beklemez; bekleyen (henüz yazılmamış) değişiklikleri en geç bir aralık sonra görür.
+class LibrarySearch:
+    def __init__(self, path, limit=200):
+        self.conn = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True)
+        self.limit = limit
+        self.fts = bool(self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'track_search'"
+        ).fetchone())
+
+    def close(self):
+        self.conn.close()
+
+    def search(self, query):
+        match = search_match(query)
+        if not match:
+            return []
+        if not self.fts:
+            return self._scan(query)
+        # bm25 sıralaması kısa öneklerde on binlerce satırı puanlar; rowid sırası
+        # (en son eklenen önce) LIMIT'te durur ve tuş başına birkaç ms sürer
+        rows = self.conn.execute(
+            "SELECT t.url, t.title, t.thumbnail, t.extra FROM track_search s JOIN tracks t ON t.id = s.rowid "
+            f"WHERE track_search MATCH ? AND {LIBRARY_MEMBER} ORDER BY s.rowid DESC LIMIT ?", (match, self.limit),
+        )
+        return [LibraryStore._track_dict(row) for row in rows]
+
+    def _scan(self, query):
+        tokens = fold_text(query).split()
+        found = []
+        for row in self.conn.execute(f"SELECT t.url, t.title, t.thumbnail, t.extra FROM tracks t WHERE {LIBRARY_MEMBER}"):
+            words = search_text(row[1], row[3]).split()
+            if all(any(w.startswith(tok) for w in words) for tok in tokens):
+                found.append(LibraryStore._track_dict(row))
+                if len(found) >= self.limit:
+                    break
+        return found
+
+
+# Yazma arkası (write-behind) kalıcılık: GUI thread'i yalnızca işlemi kuyruğa
+# koyar. İşçi, bir aralık boyunca biriken işlemleri tek SQLite
+# transaction'ında yazar; JSON dosyaları geçici dosya + fsync + rename ile
+# atomik yazılır. Okumalar (load) bekleyen yazımlardan sonra çalışır.
+class PersistenceWorker(QThread):
+    DATA_OPS = ('insert', 'remove', 'remove_track', 'move', 'replace', 'clear')
+
+    def __init__(self, path, interval_ms=500):
         super().__init__()
+        self.path = path
+        self.interval = interval_ms / 1000.0
+        self._cond = threading.Condition()
+        self._ops = []
+        self._files = {}
+        self._calls = []
+        self._stopped = False
+        self.start()
+
+    # --- GUI tarafı ---
+    def insert(self, seq, index, data): self._enqueue('insert', seq, index, dict(data))
+    def remove(self, seq, index): self._enqueue('remove', seq, index)
+    def remove_track(self, seq, url): self._enqueue('remove_track', seq, url)
+    def move(self, seq, src, dst): self._enqueue('move', seq, src, dst)
+    def replace(self, seq, items): self._enqueue('replace', seq, [dict(d) for d in items])
+    def clear(self, seq): self._enqueue('clear', seq)
+    def create_playlist(self, name): self._enqueue('create_playlist', name)
+    def delete_playlist(self, name): self._enqueue('delete_playlist', name)
+
+    def write_json(self, filename, data):
+        if data is None:
+            return
+        with self._cond:
+            self._files[filename] = data  # Aynı dosyaya bekleyen eski içerik düşer
+            self._cond.notify()
+
+    def call(self, fn):
+        future = Future()
+        with self._cond:
+            self._calls.append((fn, future))
+            self._cond.notify()
+        return future
+
+    def migrate_json(self, *files):
+        return self.call(lambda store: store.migrate_json(*files)).result()
+
+    def load(self, seq):
+        return self.call(lambda store: store.load(seq)).result()
+
+    def load_playlists(self):
+        return self.call(lambda store: store.load_playlists()).result()
+
+    def local_index(self):
+        return self.call(lambda store: store.local_index()).result()
+
+    def load_local(self):
+        return self.call(lambda store: store.load_local()).result()
+
+    def apply_scan(self, files, removed):
+        return self.call(lambda store: store.apply_scan(files, removed))
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.wait()
+
+    def _enqueue(self, name, *args):
+        with self._cond:
+            seq = ('playlist', args[0]) if name == 'delete_playlist' else args[0]
+            if name in ('replace', 'clear', 'delete_playlist'):
+                # Listeyi baştan yazan işlem, o listeye bekleyen değişiklikleri geçersiz kılar
+                self._ops = [op for op in self._ops if not (op[0] in self.DATA_OPS and op[1][0] == seq)]
+            self._ops.append((name, args))
+            self._cond.notify()
+
+    # --- İşçi thread'i ---
+    def run(self):
+        store = LibraryStore(self.path)
+        while True:
+            with self._cond:
+                while not (self._ops or self._files or self._calls or self._stopped):
+                    self._cond.wait()
+                # Yazımları biriktir: okuma ya da kapanış beklemiyorsa aralık dolsun
+                deadline = time.monotonic() + self.interval
+                while not (self._calls or self._stopped):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                ops, self._ops = self._ops, []
+                files, self._files = self._files, {}
+                calls, self._calls = self._calls, []
+                stopping = self._stopped
+            if ops:
+                try:
+                    store.apply(ops)
+                except sqlite3.Error as e:
+                    print(f"Kütüphane yazılamadı: {e}", file=sys.stderr)
+                    if not stopping:
+                        with self._cond:
+                            self._ops[:0] = ops  # Bir sonraki turda yeniden dene
+            for filename, data in files.items():
+                write_json_atomic(filename, data)
+            for fn, future in calls:
+                try:
+                    future.set_result(fn(store))
+                except Exception as e:
+                    future.set_exception(e)
+            if stopping:
+                with self._cond:
+                    if self._ops or self._files or self._calls:
+                        continue
+                store.close()
+                return
+
+
+def write_json_atomic(filename, data):
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+    except Exception as e:
+        print(f"{filename} yazılamadı: {e}", file=sys.stderr)
+
+
+YOUTUBE_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})')
+
+
+# Aynı videonun farklı adres biçimleri (youtu.be, &list=..., vb.) tek anahtara iner
+def track_key(url):
+    if not url:
+        return url
+    m = YOUTUBE_ID_RE.search(url)
+    return m.group(1) if m else url
+
+
+# Yerel klasörlerden gelen parçalar file:// adresiyle tutulur, çözümleme gerekmez
+def is_local_track(url):
+    return bool(url) and url.startswith('file:')
+
+
+# Favoriler: video id/URL anahtarlı sözlük. Üyelik, ekleme ve çıkarma O(1);
+# görünen sıra favoriler modelinde tutulur.
+class FavoritesIndex:
+    def __init__(self, items=()):
+        self._items = OrderedDict()
+        for data in items:
+            self.add(data)
+
+    def __contains__(self, url):
+        return track_key(url) in self._items
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, url):
+        return self._items.get(track_key(url))
+
+    def add(self, data):
+        key = track_key(data.get('url'))
+        if not key or key in self._items:
+            return False
+        self._items[key] = data
+        return True
+
+    def discard(self, url):
+        return self._items.pop(track_key(url), None)
+
+
+# Büyük/küçük harf, boşluk ve aksan farklarını yok sayar: "Şebnem  FERAH" == "sebnem ferah"
+def fold_text(text):
+    text = unicodedata.normalize('NFKD', text.replace('ı', 'i').replace('İ', 'i'))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.casefold().split())
+
+
+# Arama sonuçları önbelleği: normalize edilmiş sorgu -> ilk sayfa sonuçları.
+# ttl içinde taze, max_age'e kadar bayat (gösterilir ama arka planda yenilenir).
+class SearchCache:
+    def __init__(self, filename, ttl, max_age, max_entries=300):
+        self.filename = filename
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._dirty = False
+        if os.path.exists(filename):
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                now = time.time()
+                for key, entry in sorted(data.items(), key=lambda kv: kv[1].get('ts', 0)):
+                    if now - entry.get('ts', 0) < max_age:
+                        self._entries[key] = entry
+            except Exception:
+                pass
+
+    def get(self, query):
+        key = fold_text(query)
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        age = time.time() - entry['ts']
+        if age >= self.max_age:
+            del self._entries[key]
+            self._dirty = True
+            return None
+        self._entries.move_to_end(key)
+        return entry['results'], entry['has_more'], age < self.ttl
+
+    def put(self, query, results, has_more):
+        key = fold_text(query)
+        self._entries.pop(key, None)
+        self._entries[key] = {'ts': time.time(), 'results': list(results), 'has_more': has_more}
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def snapshot(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return {k: dict(e) for k, e in self._entries.items()}
+
+
+class ThumbnailJob:
+    __slots__ = ('url', 'size', 'target', 'callback', 'group', 'priority', 'cancelled', 'started')
+
+    def __init__(self, url, size, target, callback, group, priority=0):
         self.url = url
-        self.item = list_item
+        self.size = size
+        self.target = target
+        self.callback = callback
+        self.group = group
+        self.priority = priority
+        self.cancelled = False
+        self.started = False
+
+
+class ThumbnailWorker(QThread):
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
 
     def run(self):
-        try:
-            # Standart tarayıcı gibi resim indir
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            data = requests.get(self.url, headers=headers, timeout=10).content
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            self.image_loaded.emit(self.item, pixmap)
-        except Exception:
-            pass
+        while True:
+            job = self.service._take_job()
+            if job is None:
+                return
+            image = None
+            try:
+                image = self.load(job.url, job.size)
+            except Exception:
+                pass
+            self.service._job_done.emit(job, image)
+
+    # Çözme ve küçültme burada, QImage olarak yapılır; GUI'ye yalnızca
+    # gösterilecek boyuttaki küçük resim gider
+    def load(self, url, size):
+        cache = self.service.cache
+        image = cache.load_disk(url)
+        if image is None:
+            image = decode_image(http_client().get_bytes(url), THUMB_SIZE)
+            if image is None:
+                return None
+            cache.store_disk(url, image)
+        image = fit_image(image, size).convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        cache.put_memory(url, size, image)
+        return image
+
+
+# JPEG'ler okunurken küçültülür; tam boy resim hiç belleğe açılmaz
+def decode_image(data, size):
+    buf = QBuffer()
+    buf.setData(data)
+    buf.open(QIODevice.ReadOnly)
+    reader = QImageReader(buf)
+    source = reader.size()
+    if source.isValid() and (source.width() > size[0] or source.height() > size[1]):
+        reader.setQuality(100)
+        reader.setScaledSize(source.scaled(size[0], size[1], Qt.KeepAspectRatio))
+    image = reader.read()
+    return None if image.isNull() else image
+
+
+def fit_image(image, size):
+    if image.width() > size[0] or image.height() > size[1]:
+        return image.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+# Kapak resimlerini sınırlı sayıda işçiyle, öncelik sırasıyla indirir.
+# Her liste kendi grubunu kullanır; liste temizlenince cancel_group ile
+# bekleyen istekler düşürülür, biten işler hemen bırakılır.
+class ThumbnailService(QObject):
+    _job_done = pyqtSignal(object, object)
+
+    def __init__(self, max_workers, cache, parent=None):
+        super().__init__(parent)
+        self.max_workers = max(1, int(max_workers))
+        self.cache = cache
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._cancelled_in_heap = 0
+        self._idle = 0
+        self._stopped = False
+        self._workers = []
+        self._groups = {}
+        self._job_done.connect(self._on_job_done)
+
+    def request(self, url, target, callback, group, priority=0, size=THUMB_SIZE):
+        if not url or self._stopped:
+            return None
+        image = self.cache.get_memory(url, size)
+        if image is not None:
+            callback(target, QPixmap.fromImage(image))
+            return None
+        job = ThumbnailJob(url, size, target, callback, group, priority)
+        self._groups.setdefault(group, set()).add(job)
+        with self._cond:
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            if self._idle == 0 and len(self._workers) < self.max_workers:
+                worker = ThumbnailWorker(self)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return job
+
+    def cancel_group(self, group):
+        jobs = self._groups.pop(group, None)
+        if not jobs:
+            return
+        with self._cond:
+            for job in jobs:
+                job.cancelled = True
+            self._cancelled_in_heap += len(jobs)
+            self._compact()
+
+    # Henüz bir işçi almadıysa tek işi iptal eder; başlamış işler bitmeye bırakılır
+    def cancel(self, job):
+        with self._cond:
+            if job.started or job.cancelled:
+                return False
+            job.cancelled = True
+            self._cancelled_in_heap += 1
+            self._compact()
+        jobs = self._groups.get(job.group)
+        if jobs is not None:
+            jobs.discard(job)
+        return True
+
+    def _compact(self):
+        # İptal edilenler yığının yarısını geçtiyse yığını yeniden kur
+        if self._cancelled_in_heap * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if not e[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+
+    def shutdown(self, timeout_ms=2000):
+        for group in list(self._groups):
+            self.cancel_group(group)
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.wait(timeout_ms)
+
+    # İşçi thread'lerinden çağrılır
+    def _take_job(self):
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None
+                while self._heap:
+                    job = heapq.heappop(self._heap)[2]
+                    if not job.cancelled:
+                        job.started = True
+                        return job
+                    self._cancelled_in_heap = max(0, self._cancelled_in_heap - 1)
+                self._idle += 1
+                self._cond.wait()
+                self._idle -= 1
+
+    def _on_job_done(self, job, image):
+        jobs = self._groups.get(job.group)
+        if jobs is not None:
+            jobs.discard(job)
+            if not jobs:
+                del self._groups[job.group]
+        if job.cancelled or image is None or image.isNull():
+            return
+        job.callback(job.target, QPixmap.fromImage(image))
+
+
+# Ses kalitesi tercihi -> yt-dlp biçim seçimi. Önce tercih edilen kap (m4a/opus),
+# sonra herhangi bir yalnız-ses biçimi, en son video+ses Format 18.
+AUDIO_FORMATS = {
+    'high': 'bestaudio[protocol=https]',
+    'balanced': 'bestaudio[ext=m4a][protocol=https]/bestaudio[acodec=opus][protocol=https]/bestaudio[protocol=https]',
+    'low': 'worstaudio[abr>=48][protocol=https]/worstaudio[protocol=https]',
+}
+
+
+def stream_format(quality):
+    audio = AUDIO_FORMATS.get(quality, AUDIO_FORMATS['balanced'])
+    return f"{audio}/18/best[ext=mp4]"
+
+
+# --- Çözümleyici işçi süreçleri ---
+# yt-dlp çıkarımı GUI sürecinde GIL için Qt ile yarışmasın diye ayrı
+# süreçlerde çalışır. Her süreç YoutubeDL örneklerini canlı tutar.
+# İstek: {'op': 'search' | 'stream' | 'ping', 'ticket': int, ...}
+# Yanıtlar ortak bir olay kuyruğundan (ticket, tür, veri) olarak döner:
+#   ('item', sonuç)  -> akış halindeki ara sonuçlar (arama)
+#   ('done', {'ok': True, 'data': ...} | {'ok': False, 'error': str})
+# Aynı süreçten gelen mesajlar sırayı korur, 'done' her zaman en sondadır.
+# 'channel' taşıyan istekler o kanalın nesliyle damgalanır; kanal yeni bir
+# nesle geçince (ör. yeni arama) eski istekler çalışırken bile yarıda kesilir.
+# Arama düz (flat) çıkarımla yapılır: sonuç başına sayfa indirilmez, tam
+# meta veri ancak şarkı çalındığında ya da üzerine gelindiğinde 'stream' ile gelir.
+RESOLVER_PROFILES = {
+    'search': {
+        'quiet': True,
+        'noplaylist': True,
+        'extract_flat': 'in_playlist',
+    },
+    # Yalnızca ses, doğrudan https (HLS/DASH parçası değil), bu yüzden 403'e
+    # takılmaz. Hiçbiri yoksa eski güvenli yol Format 18'e (360p MP4) düşülür.
+    'stream': {
+        'format': stream_format(SETTINGS['audio_quality']),
+        'quiet': True,
+        'noplaylist': True,
+        'youtube_include_dash_manifest': False, # Karmaşık yayınları engelle
+        # 'android' istemcisi bu formatı sorunsuz verir
+        'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
+    },
+    # Eğer android başarısız olursa (nadiren), iOS dene
+    'stream_ios': {
+        'format': stream_format(SETTINGS['audio_quality']),
+        'quiet': True,
+        'noplaylist': True,
+        'youtube_include_dash_manifest': False,
+        'extractor_args': {'youtube': {'player_client': ['ios']}},
+    },
+}
+
+RESOLVER_CHANNELS = ('search',)
+
+_resolver_ydls = {}
+# Arama imleçleri: (sorgu, nesil) -> [kalan girdiler, sıradaki konum]. "Daha
+# fazla" isteği kaldığı yerden devam eder; önceki sayfalar yeniden indirilmez.
+_search_cursors = OrderedDict()
+SEARCH_SPAN = 1000  # ytsearch üst sınırı; girdiler yine de sayfa sayfa, tembel gelir
+_resolver_events = None
+_resolver_generations = None
+
+
+class ResolverCancelled(Exception):
+    pass
+
+
+def _resolver_init(events, generations):
+    global _resolver_events, _resolver_generations
+    _resolver_events = events
+    _resolver_generations = generations
+
+
+def _resolver_check(request):
+    channel = request.get('channel')
+    if channel and request.get('generation', 0) < _resolver_generations[channel].value:
+        raise ResolverCancelled("Yeni bir istekle geçersiz kaldı.")
+
+
+def _resolver_emit(ticket, kind, payload):
+    _resolver_events.put((ticket, kind, payload))
+
+
+def _resolver_ydl(profile):
+    ydl = _resolver_ydls.get(profile)
+    if ydl is None:
+        import yt_dlp
+        ydl = yt_dlp.YoutubeDL(RESOLVER_PROFILES[profile])
+        _resolver_ydls[profile] = ydl
+    return ydl
+
+
+def _entry_thumbnail(e):
+    if e.get('thumbnail'):
+        return e['thumbnail']
+    # Düz sonuçlarda tek adres yerine thumbnails listesi gelir
+    thumbs = [t for t in (e.get('thumbnails') or []) if t.get('url')]
+    if thumbs:
+        return thumbs[-1]['url']
+    if e.get('id') and e.get('ie_key', 'Youtube') == 'Youtube':
+        return f"https://i.ytimg.com/vi/{e['id']}/hqdefault.jpg"
+    return None
+
+
+def _slim_entry(e):
+    # Süreçler arası yalnızca arayüzün kullandığı alanlar taşınır
+    return {
+        'id': e.get('id'),
+        'title': e.get('title'),
+        'url': e.get('url'),
+        'webpage_url': e.get('webpage_url'),
+        'thumbnail': _entry_thumbnail(e),
+        'duration': e.get('duration'),
+        'uploader': e.get('uploader') or e.get('channel'),
+    }
+
+
+def _track_details(info):
+    return {
+        'title': info.get('title'),
+        'duration': info.get('duration'),
+        'uploader': info.get('uploader') or info.get('channel'),
+        'view_count': info.get('view_count'),
+        'upload_date': info.get('upload_date'),
+    }
+
+
+def _resolver_search(request):
+    query = request['query']
+    start = request.get('start', 0)
+    count = request.get('count', 10)
+    ydl = _resolver_ydl('search')
+    direct = bool(re.match(r'^[a-z][a-z0-9+.-]*://', query, re.I))
+    if direct:
+        # Doğrudan bağlantı: tek sonuç, sayfalama yok
+        info = ydl.extract_info(query, download=False)
+        entries = (info.get('entries') or [info]) if info and start == 0 else []
+    else:
+        # process=False ile girdiler YouTube'dan sayfa sayfa, tembel gelir
+        key = (query, request.get('generation', 0))
+        cursor = _search_cursors.pop(key, None)
+        if cursor is None or cursor[1] != start:
+            info = ydl.extract_info(f"ytsearch{SEARCH_SPAN}:{query}", download=False, process=False)
+            cursor = [itertools.islice((info or {}).get('entries') or [], start, None), start]
+        entries = cursor[0]
+    sent = 0
+    has_more = False
+    for e in entries:
+        if not e:
+            continue
+        if sent == count:
+            # Bir fazlası okunur ki sonraki sayfa olup olmadığı bilinsin; imleçte saklanır
+            has_more = True
+            if not direct:
+                _search_cursors[key] = [itertools.chain([e], entries), start + sent]
+                while len(_search_cursors) > 8:
+                    _search_cursors.popitem(last=False)
+            break
+        _resolver_check(request)
+        _resolver_emit(request['ticket'], 'item', _slim_entry(e))
+        sent += 1
+    if sent == 0 and start == 0:
+        raise LookupError("Sonuç yok.")
+    return {'count': sent, 'has_more': has_more}
+
+
+def resolve_stream_info(video_url):
+    info = _resolver_ydl('stream').extract_info(video_url, download=False)
+    if not info or 'url' not in info:
+        info = _resolver_ydl('stream_ios').extract_info(video_url, download=False)
+    if not info or 'url' not in info:
+        return None
+    return info
+
+
+def _resolver_stream(request):
+    info = resolve_stream_info(request['url'])
+    if not info:
+        raise LookupError("Bağlantı alınamadı (Format sorunu).")
+    return {'stream_url': info['url'], 'details': _track_details(info)}
+
+
+def _resolver_handle(request):
+    op = request.get('op')
+    try:
+        _resolver_check(request)
+        if op == 'search':
+            data = _resolver_search(request)
+        elif op == 'stream':
+            data = _resolver_stream(request)
+        elif op == 'ping':
+            # Süreci ısıt: yt_dlp ve çıkarıcılar önceden yüklensin
+            for profile in RESOLVER_PROFILES:
+                _resolver_ydl(profile)
+            data = os.getpid()
+        else:
+            raise ValueError(f"Bilinmeyen işlem: {op}")
+        response = {'ok': True, 'data': data}
+    except Exception as e:
+        response = {'ok': False, 'error': str(e)}
+    _resolver_emit(request['ticket'], 'done', response)
 
 
-class SearchThread(QThread):
-    results_ready = pyqtSignal(list)
-    error_occurred = pyqtSignal(str)
+# Olay kuyruğunu okuyup mesajları ana thread'e taşır
+class ResolverListener(QThread):
+    message = pyqtSignal(int, str, object)
 
-    def __init__(self, query):
+    def __init__(self, events):
         super().__init__()
-        self.query = query
+        self.events = events
 
     def run(self):
+        while True:
+            try:
+                msg = self.events.get()
+            except (EOFError, OSError):
+                return
+            if msg is None:
+                return
+            self.message.emit(*msg)
+
+
+# GUI tarafı: istekleri işçi süreçlere dağıtır, yanıtları ana thread'de
+# geri çağırma ile teslim eder. İptal edilen isteklerin mesajları düşürülür.
+class ResolverPool(QObject):
+    _failed = pyqtSignal(int, object)
+
+    def __init__(self, workers=2, parent=None):
+        super().__init__(parent)
+        self.workers = max(1, int(workers))
+        self._ctx = multiprocessing.get_context('spawn')
+        self._events = None
+        self._listener = None
+        self._executor = None
+        self._search_executor = None
+        self._tickets = itertools.count(1)
+        self._pending = {}
+        self._generations = {c: self._ctx.Value('q', 0) for c in RESOLVER_CHANNELS}
+        self._failed.connect(self._on_done)
+
+    # Arama kanalı tek süreçli ayrı havuzda çalışır ki sayfalar aynı imleci bulsun
+    def _ensure_executor(self, search=False):
+        if self._events is None:
+            self._events = self._ctx.Queue()
+            self._listener = ResolverListener(self._events)
+            self._listener.message.connect(self._on_message)
+            self._listener.start()
+        if search:
+            if self._search_executor is None:
+                self._search_executor = self._new_executor(1)
+            return self._search_executor
+        if self._executor is None:
+            self._executor = self._new_executor(self.workers)
+        return self._executor
+
+    def _new_executor(self, workers):
         try:
-            # Arama ayarları
-            ydl_opts = {
-                'quiet': True,
-                'noplaylist': True,
-                'default_search': 'ytsearch5',
-                'extract_flat': False,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.query, download=False)
+            return ProcessPoolExecutor(
+                max_workers=workers, mp_context=self._ctx,
+                initializer=_resolver_init, initargs=(self._events, self._generations),
+            )
+        except Exception:
+            # Süreç açılamıyorsa (kısıtlı ortam) thread havuzuyla devam et
+            _resolver_init(self._events, self._generations)
+            return ThreadPoolExecutor(max_workers=workers)
+
+    def warm(self):
+        for _ in range(self.workers):
+            self.submit({'op': 'ping'}, None)
+        self.submit({'op': 'ping', 'channel': 'search'}, None)
+
+    # Kanalı yeni nesle geçirir; önceki nesilden istekler işçide bırakılır
+    def supersede(self, channel):
+        generation = self._generations[channel]
+        with generation.get_lock():
+            generation.value += 1
+            return generation.value
+
+    def submit(self, request, callback, on_item=None):
+        ticket = next(self._tickets)
+        request = dict(request, ticket=ticket)
+        if request.get('channel') and 'generation' not in request:
+            request['generation'] = self._generations[request['channel']].value
+        self._pending[ticket] = (callback, on_item)
+        search = request.get('channel') == 'search'
+        try:
+            future = self._ensure_executor(search).submit(_resolver_handle, request)
+        except Exception:
+            # Bir işçi süreç çöktüyse havuz kullanılamaz; yenisini kur
+            if search: self._search_executor = None
+            else: self._executor = None
+            try:
+                future = self._ensure_executor(search).submit(_resolver_handle, request)
+            except Exception as e:
+                error = str(e)
+                QTimer.singleShot(0, lambda: self._on_done(ticket, {'ok': False, 'error': error}))
+                return ticket
+        self._pending[ticket] = (callback, on_item, future)
+        future.add_done_callback(lambda f, t=ticket: self._on_future_done(t, f))
+        return ticket
+
+    def cancel(self, ticket):
+        entry = self._pending.pop(ticket, None)
+        if entry and len(entry) > 2:
+            entry[2].cancel()
+
+    def shutdown(self):
+        self._pending.clear()
+        for executor in (self._executor, self._search_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._search_executor = None
+        if self._events is not None:
+            self._events.put(None)
+            self._listener.wait(1000)
+
+    # Havuzun kendi thread'inden çağrılır; yalnızca çöken işleri bildirir
+    def _on_future_done(self, ticket, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            try:
+                self._failed.emit(ticket, {'ok': False, 'error': str(error)})
+            except RuntimeError:
+                pass
 
-                if not info:
-                    self.error_occurred.emit("Sonuç yok.")
-                    return
+    def _on_message(self, ticket, kind, payload):
+        if kind == 'item':
+            entry = self._pending.get(ticket)
+            if entry and entry[1] is not None:
+                entry[1](payload)
+        elif kind == 'done':
+            self._on_done(ticket, payload)
 
-                if 'entries' in info and info['entries']:
-                    results = [e for e in info['entries'] if e]
-                else:
-                    results = [info]
+    def _on_done(self, ticket, response):
+        entry = self._pending.pop(ticket, None)
+        if entry and entry[0] is not None:
+            entry[0](response)
 
-                if not results:
-                    self.error_occurred.emit("Sonuç yok.")
-                else:
-                    self.results_ready.emit(results)
 
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+# Çalan şarkı sürerken sıradaki şarkıların akış adreslerini arka planda çözer.
+# Hedef listesi her değiştiğinde bekleyenler yenisiyle değiştirilir; çözümleyici
+# havuzunu kullanıcının isteklerine açık bırakmak için aynı anda tek istek yollar.
+class StreamPrefetcher(QObject):
+    resolved = pyqtSignal(str, object)
 
+    def __init__(self, resolver, cache, parent=None):
+        super().__init__(parent)
+        self.resolver = resolver
+        self.cache = cache
+        self._targets = []
+        self._current = None
+        self._ticket = None
+
+    def set_targets(self, video_urls):
+        self._targets = [u for u in video_urls if u]
+        if self._current is None:
+            self._next()
+
+    def is_resolving(self, video_url):
+        return self._current == video_url
+
+    def stop(self):
+        self._targets = []
+        if self._ticket is not None:
+            self.resolver.cancel(self._ticket)
+        self._current = self._ticket = None
+
+    def _next(self):
+        self._current = self._ticket = None
+        while self._targets:
+            video_url = self._targets.pop(0)
+            if self.cache.get(video_url):
+                continue
+            self._current = video_url
+            self._ticket = self.resolver.submit(
+                {'op': 'stream', 'url': video_url},
+                lambda r, u=video_url: self._on_resolved(u, r),
+            )
+            return
+
+    def _on_resolved(self, video_url, response):
+        if response.get('ok'):
+            self.cache.put(video_url, response['data']['stream_url'])
+            self.resolved.emit(video_url, response['data'])
+        self._next()
 
-class AudioThread(QThread):
-    url_ready = pyqtSignal(str, str)
-    error_occurred = pyqtSignal(str)
 
-    def __init__(self, video_url, title):
+# Tüm indirmelerin paylaştığı hız sınırı. Her parça için bir sonraki serbest
+# zaman ileri kaydırılır; yarım saniyelik patlamaya izin verilir.
+class RateLimiter:
+    BURST = 0.5
+
+    def __init__(self, bytes_per_sec):
+        self.rate = bytes_per_sec
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def consume(self, n):
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._next = max(self._next, now - self.BURST) + n / self.rate
+            delay = self._next - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Yarım .part dosyası taze akış adresinin boyuyla uyuşmuyor (başka itag)
+class PartMismatch(Exception):
+    pass
+
+
+class DownloadJob:
+    def __init__(self, track):
+        self.track = {k: v for k, v in track.items() if k != 'part_size'}
+        self.url = track['url']
+        self.stream_url = None
+        self.done = 0
+        self.total = 0
+        self.expected = track.get('part_size') or 0  # .part'ın ait olduğu akışın boyu
+        self.status = None   # hata olduysa HTTP durum kodu
+        self.retries = 0
+        self.failures = 0    # üst üste ağ hataları
+        self.cancelled = False
+
+
+class DownloadWorker(QThread):
+    def __init__(self, manager):
         super().__init__()
-        self.url = video_url
-        self.title = title
+        self.manager = manager
 
     def run(self):
+        while True:
+            job = self.manager._take_job()
+            if job is None:
+                return
+            ok = False
+            start = 0
+            part = self.manager.cache.part_path(job.url, stream_extension(job.stream_url))
+            try:
+                os.makedirs(self.manager.cache.directory, exist_ok=True)
+                job.done = start = os.path.getsize(part) if os.path.exists(part) else 0
+                clen = stream_length(job.stream_url)
+                if job.done and job.expected and clen and clen != job.expected:
+                    raise PartMismatch()
+                with open(part, "ab") as f:
+                    ok = http_client().download(
+                        job.stream_url, f, job.done, lambda n: self._on_chunk(job, n),
+                        lambda total: self._on_length(job, total), DOWNLOAD_SPAN,
+                        on_restart=lambda: setattr(job, 'done', 0),
+                    )
+                if ok:
+                    self.manager.cache.commit(job.url, part)
+            except Exception as e:
+                job.status = getattr(getattr(e, 'response', None), 'status_code', None)
+                if job.done > start:
+                    job.failures = 0  # bağlantı koptu ama ilerlemişti; bekleme baştan sayılır
+                if isinstance(e, PartMismatch):
+                    job.status = 416
+                # .part bozuk, akıştan uzun ya da başka bir itag'e ait; baştan indirilsin.
+                # Son deneme de olmadıysa bırakılır ki önbellek bütçesi dışında birikmesin.
+                if job.status == 416 or (not job.cancelled and self.manager._retry_delay(job) is None):
+                    try: os.remove(part)
+                    except OSError: pass
+            self.manager._job_done.emit(job, ok)
+
+    # Devam edilen .part başka boydaki bir akışa aitse üstüne eklenmez
+    def _on_length(self, job, total):
+        if job.done and job.expected and total != job.expected:
+            raise PartMismatch()
+        job.total = total
+        if job.expected != total:
+            job.expected = total
+            self.manager._sized.emit()
+
+    def _on_chunk(self, job, n):
+        self.manager.limiter.consume(n)
+        job.done += n
+        return not job.cancelled
+
+
+# Toplu indirme yöneticisi (favoriler, playlistler ve çalınan parçalar).
+# Sıra downloads.json'da tutulur, açılışta kaldığı yerden sürer; yarım .part
+# dosyaları Range ile devam ettirilir. Akış adresi GUI'deki ResolverPool ile
+# teker teker çözülür (çalma isteklerini bekletmesin), indirme sınırlı sayıda
+# işçi thread'inde ortak hız sınırıyla yapılır.
+class DownloadManager(QObject):
+    NETWORK_RETRIES = 4
+    progress = pyqtSignal()
+    saved = pyqtSignal(str)
+    _job_done = pyqtSignal(object, bool)
+    _sized = pyqtSignal()
+
+    def __init__(self, cache, resolver, stream_cache, workers, rate_kbps, state_file, persist, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.resolver = resolver
+        self.stream_cache = stream_cache
+        self.max_workers = max(1, int(workers))
+        self.limiter = RateLimiter(rate_kbps * 1024)
+        self.persist = persist
+        self.state_file = state_file
+        self.pending = OrderedDict()  # video_url -> DownloadJob (henüz başlamadı)
+        self.active = {}              # video_url -> DownloadJob (çözülüyor ya da iniyor)
+        self.waiting = {}             # video_url -> DownloadJob (ağ hatası sonrası bekliyor)
+        self.completed = 0
+        self.failed = 0
+        self.batch = 0                # Sıra boşalana kadar eklenen toplam iş
+        self._resolving = None
+        self._cond = threading.Condition()
+        self._ready = []
+        self._idle = 0
+        self._workers = []
+        self._stopped = False
+        self._job_done.connect(self._on_job_done)
+        self._sized.connect(self._save_state)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.timeout.connect(self.progress.emit)
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, "r", encoding="utf-8") as f:
+                    QTimer.singleShot(0, lambda tracks=json.load(f): self.enqueue(tracks))
+            except Exception:
+                pass
+
+    def is_queued(self, video_url):
+        return video_url in self.pending or video_url in self.active or video_url in self.waiting
+
+    def enqueue(self, tracks, stream_url=None, first=False):
+        added = 0
+        for track in tracks:
+            url = track.get('url')
+            if not url or is_local_track(url) or self.is_queued(url) or self.cache.has(url):
+                continue
+            job = DownloadJob(track)
+            job.stream_url = stream_url
+            self.pending[url] = job
+            if first:
+                self.pending.move_to_end(url, last=False)
+            added += 1
+        if added:
+            self.batch += added
+            self._save_state()
+            self._fill()
+        return added
+
+    # Çalınmaya başlayan parçanın adresi zaten çözülmüş; sıranın başına alınır
+    def save(self, track, stream_url):
+        self.enqueue([track], stream_url, first=True)
+
+    def stop(self, timeout_ms=2000):
+        self._stopped = True
+        self._progress_timer.stop()
+        for job in self.active.values():
+            job.cancelled = True
+        with self._cond:
+            self._ready.clear()
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.wait(timeout_ms)
+
+    def snapshot(self):
+        jobs = list(self.active.values())
+        return {
+            'completed': self.completed,
+            'failed': self.failed,
+            'total': self.batch,
+            'bytes_done': sum(j.done for j in jobs),
+            'bytes_total': sum(j.total for j in jobs),
+            'active': [(j.track.get('title', ''), j.done, j.total) for j in jobs],
+        }
+
+    def _save_state(self):
+        jobs = list(self.active.values()) + list(self.pending.values()) + list(self.waiting.values())
+        tracks = [dict(j.track, part_size=j.expected) if j.expected else j.track for j in jobs]
+        self.persist(self.state_file, tracks)
+
+    def _fill(self):
+        if self._stopped:
+            return
+        for url in list(self.pending):
+            if len(self.active) >= self.max_workers:
+                break
+            job = self.pending.get(url)
+            if job is None:
+                continue  # Çözümleyici geri çağrısı sırayı bu arada ilerletti
+            if job.stream_url is None:
+                job.stream_url = self.stream_cache.get(url)
+            if job.stream_url is None and self._resolving is not None:
+                continue
+            del self.pending[url]
+            self.active[url] = job
+            if job.stream_url is None:
+                self._resolving = job
+                self.resolver.submit({'op': 'stream', 'url': url}, lambda r, job=job: self._on_resolved(job, r))
+            else:
+                self._start(job)
+        if self.active and not self._progress_timer.isActive():
+            self._progress_timer.start(500)
+        self.progress.emit()
+
+    def _on_resolved(self, job, response):
+        self._resolving = None
+        if self._stopped:
+            return
+        if response.get('ok'):
+            job.stream_url = response['data']['stream_url']
+            self.stream_cache.put(job.url, job.stream_url)
+            self._start(job)
+        else:
+            self._finish(job, False)
+        self._fill()
+
+    def _start(self, job):
+        with self._cond:
+            self._ready.append(job)
+            if self._idle == 0 and len(self._workers) < self.max_workers:
+                worker = DownloadWorker(self)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+
+    # İşçi thread'lerinden çağrılır
+    def _take_job(self):
+        with self._cond:
+            while not self._ready:
+                if self._stopped:
+                    return None
+                self._idle += 1
+                self._cond.wait()
+                self._idle -= 1
+            return None if self._stopped else self._ready.pop(0)
+
+    # Başarısız iş yeniden denenecekse kaç ms sonra (0: hemen), denenmeyecekse None.
+    # İşçi thread'i de son denemede .part'ı silmek için çağırır.
+    def _retry_delay(self, job):
+        if job.cancelled:
+            return None
+        if job.status in (403, 410, 416):
+            return 0 if job.retries < 1 else None
+        if job.status is None or job.status >= 500:
+            # Kopan bağlantı, zaman aşımı vb.: bekleme her denemede ikiye katlanır
+            return 2000 * 2 ** job.failures if job.failures < self.NETWORK_RETRIES else None
+        return None
+
+    def _on_job_done(self, job, ok):
+        if self._stopped:
+            return
+        delay = None if ok else self._retry_delay(job)
+        if delay == 0:
+            # Akış adresinin süresi dolmuş; bir kez taze adresle dene
+            self.stream_cache.invalidate(job.url)
+            job.retries += 1
+            job.status = job.stream_url = None
+            del self.active[job.url]
+            self.pending[job.url] = job
+            self.pending.move_to_end(job.url, last=False)
+        elif delay is not None:
+            # Sırada kalır; süre dolunca .part'tan Range ile devam edilir
+            job.failures += 1
+            job.status = None
+            del self.active[job.url]
+            self.waiting[job.url] = job
+            QTimer.singleShot(delay, lambda: self._resume(job))
+        else:
+            self._finish(job, ok)
+        self._fill()
+
+    def _resume(self, job):
+        if self._stopped or self.waiting.pop(job.url, None) is None:
+            return
+        self.pending[job.url] = job
+        self._fill()
+
+    def _finish(self, job, ok):
+        self.active.pop(job.url, None)
+        if ok:
+            self.completed += 1
+            self.saved.emit(job.url)
+        else:
+            self.failed += 1
+        if not self.active and not self.pending and not self.waiting:
+            self.completed = self.failed = self.batch = 0
+            self._progress_timer.stop()
+        self._save_state()
+
+
+# --- Yerel müzik tarayıcı ---
+# Klasörler thread'lerle paralel gezilir; yalnızca yeni ya da (mtime, boyut)
+# değişmiş dosyaların etiketleri süreç havuzunda okunur, silinenler kaldırılır.
+def scan_tree(root):
+    found = []
+    stack = [root]
+    while stack:
         try:
-            # --- KESİN ÇÖZÜM: FORMAT 18 ---
-            # Format 18: 640x360 MP4 (H.264 + AAC).
-            # Bu format HLS (m3u8) içermez, bu yüzden 403 hatasına takılmaz.
-            ydl_opts = {
-                'format': '18/best[ext=mp4]', # Önce Format 18'i zorla, olmazsa en iyi MP4'ü al
-                'quiet': True,
-                'noplaylist': True,
-                'youtube_include_dash_manifest': False, # Karmaşık yayınları engelle
-                # 'android' istemcisi bu formatı sorunsuz verir
-                'extractor_args': {'youtube': {'player_client': ['android', 'web']}},
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-                
-                # Eğer android başarısız olursa (nadiren), iOS dene
-                if not info or 'url' not in info:
-                    ydl_opts['extractor_args'] = {'youtube': {'player_client': ['ios']}}
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl2:
-                        info = ydl2.extract_info(self.url, download=False)
-                
-                if not info or 'url' not in info:
-                    self.error_occurred.emit("Bağlantı alınamadı (Format sorunu).")
-                    return
-                    
-                self.url_ready.emit(info['url'], self.title)
-                
-        except Exception as e:
-            self.error_occurred.emit(f"Hata: {str(e)}")
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for e in entries:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif e.name.lower().endswith(AUDIO_EXTENSIONS):
+                        st = e.stat()
+                        found.append((e.path, st.st_mtime, st.st_size))
+                except OSError:
+                    pass
+    return found
+
+
+# Süreç havuzunda çalışır. mutagen yoksa dosya adından "Sanatçı - Başlık" çıkarılır.
+def read_tags(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    artist, sep, title = stem.partition(' - ')
+    data = {'title': title.strip() if sep else stem, 'url': Path(path).as_uri(), 'thumbnail': '', 'path': path}
+    if sep:
+        data['uploader'] = artist.strip()
+    try:
+        import mutagen
+        audio = mutagen.File(path, easy=True)
+    except Exception:
+        audio = None
+    if audio is not None:
+        tags = audio.tags or {}
+        for key, field in (('title', 'title'), ('artist', 'uploader'), ('album', 'album')):
+            try:
+                value = tags.get(key)
+            except Exception:
+                value = None
+            if value:
+                data[field] = str(value[0])
+        length = getattr(getattr(audio, 'info', None), 'length', 0)
+        if length:
+            data['duration'] = int(length)
+    return data
+
+
+class LibraryScanner(QThread):
+    scanned = pyqtSignal(object)  # {'files', 'changed', 'removed', 'seconds', 'tracks', 'dirty'}
+    BATCH = 500
+
+    def __init__(self, store, folders, workers, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.folders = list(folders)
+        self.workers = max(1, int(workers))
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    def run(self):
+        started = time.monotonic()
+        known = self.store.local_index()
+        roots = [os.path.abspath(f) for f in self.folders if os.path.isdir(f)]
+        # Her kökün alt klasörleri ayrı görev olur ki büyük tek bir kök de paralel gezilsin
+        tasks = []
+        seen = {}
+        for root in roots:
+            try:
+                with os.scandir(root) as entries:
+                    for e in entries:
+                        if e.is_dir(follow_symlinks=False):
+                            tasks.append(e.path)
+                        elif e.name.lower().endswith(AUDIO_EXTENSIONS):
+                            st = e.stat()
+                            seen[e.path] = (st.st_mtime, st.st_size)
+            except OSError:
+                pass
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for found in pool.map(scan_tree, tasks):
+                for path, mtime, size in found:
+                    seen[path] = (mtime, size)
+
+        changed = [p for p, stat in seen.items() if known.get(p) != stat]
+        removed = [p for p in known if p not in seen]
+        pending = None
+        if changed and not self._stopped:
+            pending = self._read_changed(changed, seen)
+        if removed:
+            pending = self.store.apply_scan([], removed)
+        if pending is not None:
+            pending.result()
+        # Güncel liste burada (GUI dışında) okunur; pencere yalnızca değişen satırları uygular
+        tracks = self.store.load_local() if changed or removed else None
+        self.scanned.emit({
+            'files': len(seen), 'changed': len(changed), 'removed': len(removed),
+            'seconds': round(time.monotonic() - started, 2),
+            'tracks': tracks, 'dirty': {Path(p).as_uri() for p in changed + removed},
+        })
+
+    def _read_changed(self, changed, seen):
+        # Az dosya için süreç açmaya değmez
+        pool = None
+        if len(changed) >= 32:
+            try:
+                pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+                results = pool.map(read_tags, changed, chunksize=64)
+            except Exception:
+                pool = None
+        if pool is None:
+            results = map(read_tags, changed)
+        batch = []
+        future = None
+        try:
+            for path, data in zip(changed, results):
+                batch.append((path, seen[path][0], seen[path][1], data))
+                if len(batch) >= self.BATCH:
+                    future = self.store.apply_scan(batch, [])
+                    batch = []
+                if self._stopped:
+                    batch = []
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        if batch:
+            future = self.store.apply_scan(batch, [])
+        return future
+
+
+# --- Çalma motoru ---
+# İki VLC oyuncusu: biri çalar, diğeri sıradaki parçayı bitişe yakın
+# ':start-paused' ile açıp tamponlar. Parça bitince (ya da crossfade süresi
+# kalınca) hazır oyuncuya geçilir; bağlantı ve tamponlama beklenmez.
+# Pencere python-vlc ile doğrudan konuşmaz, yalnızca bu arayüzü kullanır.
+# VLC ilk çalmada yüklenir; açılışı yavaşlatmaz.
+# Konum VLC'nin TimeChanged/LengthChanged olaylarından gelir. Olay VLC
+# thread'inde süzülür: GUI'ye yalnızca gösterilen saniye ya da kaydırıcı
+# pikseli değiştiğinde (pencere görünürken) veya bitişe yakın ön yükleme
+# gerektiğinde, üst üste binmeyen tek bir sinyal gider. Durunca olay gelmez.
+class PlaybackEngine(QObject):
+    finished = pyqtSignal()      # Parça bitti, hazır sıradaki yok
+    failed = pyqtSignal()        # Çalan parça açılamadı
+    advanced = pyqtSignal(str)   # Önceden açılan adrese kendiliğinden geçildi
+    position = pyqtSignal(int, int)  # (konum ms, süre ms)
+    _event = pyqtSignal(object, str)
+    _time_changed = pyqtSignal()
+
+    def __init__(self, crossfade_ms=0, preload_seconds=20, parent=None):
+        super().__init__(parent)
+        self.crossfade_ms = max(0, int(crossfade_ms))
+        self.preload_ms = max(int(preload_seconds * 1000), self.crossfade_ms + 2000)
+        self.volume = 80
+        self.instance = None
+        self.active = self.idle = None
+        self.url = None         # Çalan adres
+        self.auto_url = None    # Kendiliğinden geçilen, pencerenin henüz play() demediği adres
+        self.next_url = None    # Sıradaki parça için istenen adres
+        self.loaded_url = None  # Boştaki oyuncuda açılmış adres
+        self.fading = None      # (sesi kısılan oyuncu, başlangıç)
+        self._broken = False
+        self.proxy = None
+        self.report_position = True
+        self.position_interval = 250  # ms; pencere kaydırıcı genişliğine göre ayarlar
+        self._time = 0
+        self._length = -1
+        self._shown = -1        # GUI'ye en son gönderilen konum (-1: hemen gönder)
+        self._time_queued = False
+        self._event.connect(self._on_event)
+        self._time_changed.connect(self._on_time)
+
+        self.fade_timer = QTimer(self)
+        self.fade_timer.setInterval(50)
+        self.fade_timer.timeout.connect(self._on_fade_step)
+
+    # Henüz açılmadıysa da True; VLC yüklenemediği anlaşılınca False olur
+    @property
+    def available(self):
+        return not self._broken
+
+    def _ensure(self):
+        if self.active is None and not self._broken:
+            with STARTUP.phase('vlc'):
+                try:
+                    import vlc
+                    self.instance = vlc.Instance("--no-video --network-caching=10000 --quiet")
+                    players = [self.instance.media_player_new() for _ in range(2)]
+                    for player in players:
+                        em = player.event_manager()
+                        em.event_attach(vlc.EventType.MediaPlayerEndReached, lambda _e, p=player: self._emit(p, 'end'))
+                        em.event_attach(vlc.EventType.MediaPlayerEncounteredError, lambda _e, p=player: self._emit(p, 'error'))
+                        em.event_attach(vlc.EventType.MediaPlayerTimeChanged, lambda e, p=player: self._on_vlc_time(p, e.u.new_time))
+                        em.event_attach(vlc.EventType.MediaPlayerLengthChanged, lambda e, p=player: self._on_vlc_length(p, e.u.new_length))
+                    self.active, self.idle = players
+                    self.active.audio_set_volume(self.volume)
+                    self.proxy = StreamProxy()
+                except Exception:
+                    self.instance = None
+                    self._broken = True
+        return self.active is not None
+
+    # --- Pencere tarafı ---
+    def play(self, url):
+        if not self._ensure(): return
+        if url == self.auto_url:
+            self.auto_url = None  # Zaten çalıyor
+            return
+        self.auto_url = None
+        self._finish_fade()
+        if url == self.loaded_url:
+            self._swap()
+        else:
+            self.active.set_media(self._media(url))
+        self.url = url
+        self.active.audio_set_volume(self.volume)
+        self.active.play()
+        self._publish()
+
+    def preload(self, url):
+        if self.active is None or url == self.next_url: return
+        self.next_url = url
+        if self.loaded_url and self.loaded_url != url:
+            self.idle.stop()
+            self.loaded_url = None
+
+    def pause(self):
+        if self.active is None: return
+        self._finish_fade()
+        self.active.set_pause(1)
+
+    def resume(self):
+        if self.active is None: return
+        self.active.play()
+
+    def is_playing(self):
+        return self.active is not None and bool(self.active.is_playing())
+
+    def length(self):
+        return self.active.get_length() if self.active is not None else -1
+
+    def time(self):
+        return self.active.get_time() if self.active is not None else -1
+
+    def set_time(self, ms):
+        if self.active is not None: self.active.set_time(int(ms))
+
+    # Pencere gizliyken/küçültülmüşken konum sinyali gönderilmez
+    def set_position_updates(self, enabled):
+        self.report_position = enabled
+        if enabled and self.active is not None:
+            self._publish()
+
+    def set_volume(self, volume):
+        self.volume = int(volume)
+        if self.active is not None and self.fading is None:
+            self.active.audio_set_volume(self.volume)
+
+    def shutdown(self):
+        self.fade_timer.stop()
+        if self.active is None: return
+        for player in (self.active, self.idle):
+            player.stop()
+            player.release()
+        self.active = self.idle = None
+        self.instance.release()
+        self.proxy.close()
+
+    # --- İç işler ---
+    def _emit(self, player, kind):
+        # VLC thread'inden gelir; sinyal GUI thread'ine kuyruklanır
+        try: self._event.emit(player, kind)
+        except RuntimeError: pass
+
+    def _on_event(self, player, kind):
+        if kind == 'error':
+            if player is self.active:
+                self.failed.emit()
+            elif player is self.idle and self.fading is None:
+                self.loaded_url = self.next_url = None  # Ön yükleme olmadı, normal yoldan açılır
+            return
+        if self.fading and player is self.fading[0]:
+            self._finish_fade()
+        elif player is self.active:
+            if self.loaded_url:
+                self._advance()
+            else:
+                self.finished.emit()
+
+    # VLC thread'i: yalnızca değer saklanır ve gerekiyorsa tek sinyal kuyruklanır
+    def _on_vlc_time(self, player, ms):
+        if player is not self.active: return
+        self._time = ms
+        shown = self._shown
+        due = self.report_position and (
+            shown < 0 or ms // 1000 != shown // 1000 or abs(ms - shown) >= self.position_interval
+        )
+        if due:
+            self._shown = ms
+        elif not self._needs_time(ms):
+            return
+        if not self._time_queued:
+            self._time_queued = True
+            try: self._time_changed.emit()
+            except RuntimeError: pass
+
+    def _on_vlc_length(self, player, ms):
+        if player is not self.active: return
+        self._length = ms
+        self._shown = -1
+        self._on_vlc_time(player, self._time)
+
+    def _needs_time(self, ms):
+        if self._length <= 0 or self.fading: return False
+        remaining = self._length - ms
+        if self.next_url and not self.loaded_url:
+            return remaining <= self.preload_ms
+        return bool(self.crossfade_ms and self.loaded_url and remaining <= self.crossfade_ms)
+
+    def _on_time(self):
+        self._time_queued = False
+        if self.active is None: return
+        if self.report_position:
+            self.position.emit(self._time, self._length)
+        if not self._needs_time(self._time): return
+        remaining = self._length - self._time
+        if self.next_url and not self.loaded_url and remaining <= self.preload_ms:
+            media = self._media(self.next_url)
+            media.add_option(':start-paused')
+            self.idle.set_media(media)
+            self.idle.audio_set_volume(0)
+            self.idle.play()
+            self.loaded_url = self.next_url
+        if self.crossfade_ms and self.loaded_url and remaining <= self.crossfade_ms:
+            self._advance()
+
+    # Ağ akışları Range vekilinden, yerel dosyalar doğrudan açılır
+    def _media(self, url):
+        if url.startswith(('http://', 'https://')):
+            url = self.proxy.url_for(url)
+        return self.instance.media_new(url)
+
+    # Oyuncu değişince konum ve süre yeni oyuncudan hemen gönderilir
+    def _publish(self):
+        self._time = max(0, self.active.get_time())
+        self._length = self.active.get_length()
+        self._shown = self._time
+        if self.report_position:
+            self.position.emit(self._time, self._length)
+
+    def _swap(self):
+        old = self.active
+        self.active, self.idle = self.idle, old
+        old.stop()
+        self.loaded_url = self.next_url = None
+
+    def _advance(self):
+        old = self.active
+        self.active, self.idle = self.idle, old
+        self.url = self.auto_url = self.loaded_url
+        self.loaded_url = self.next_url = None
+        if self.crossfade_ms and old.is_playing():
+            self.active.audio_set_volume(0)
+            self.fading = (old, time.monotonic())
+            self.fade_timer.start()
+        else:
+            old.stop()
+            self.active.audio_set_volume(self.volume)
+        self.active.play()
+        self._publish()
+        self.advanced.emit(self.url)
+
+    def _on_fade_step(self):
+        old, started = self.fading
+        p = min(1.0, (time.monotonic() - started) * 1000 / self.crossfade_ms)
+        self.active.audio_set_volume(int(self.volume * p))
+        old.audio_set_volume(int(self.volume * (1 - p)))
+        if p >= 1: self._finish_fade()
+
+    def _finish_fade(self):
+        if self.fading is None: return
+        old, _ = self.fading
+        self.fading = None
+        self.fade_timer.stop()
+        old.stop()
+        self.active.audio_set_volume(self.volume)
 
 
 # --- 3. TASARIM ---
+# qtawesome ikonları her boyamada fontu yeniden rasterize eder. Burada her
+# (glyph, renk, boyut) bir kez pixmap'e çizilir ve aynı nesne paylaşılır.
+_glyph_pixmaps = {}
+_glyph_icons = {}
+
+
+def _glyph_key(name, color, size):
+    if isinstance(size, QSize):
+        size = (size.width(), size.height())
+    return (name, color, int(size[0]), int(size[1]))
+
+
+def glyph_pixmap(name, color, size=(16, 16)):
+    key = _glyph_key(name, color, size)
+    pixmap = _glyph_pixmaps.get(key)
+    if pixmap is None:
+        ratio = QApplication.instance().devicePixelRatio()
+        pixmap = qta.icon(name, color=color).pixmap(QSize(round(key[2] * ratio), round(key[3] * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        _glyph_pixmaps[key] = pixmap
+    return pixmap
+
+
+def glyph_icon(name, color, size=(16, 16)):
+    key = _glyph_key(name, color, size)
+    icon = _glyph_icons.get(key)
+    if icon is None:
+        icon = _glyph_icons[key] = QIcon(glyph_pixmap(name, color, size))
+    return icon
+
+
 class NeonButton(QPushButton):
     def __init__(self, icon_name, size=24, color="#bd93f9", parent=None):
         super().__init__(parent)
-        self.setIcon(qta.icon(icon_name, color=color))
         self.setIconSize(QSize(size, size))
+        self.set_glyph(icon_name, color)
         self.setCursor(Qt.PointingHandCursor)
         self.setStyleSheet(
             "QPushButton { background: transparent; border: none; }"
             "QPushButton:hover { background-color: rgba(189, 147, 249, 0.1); border-radius: 15px; }"
         )
 
+    def set_glyph(self, icon_name, color):
+        self.setIcon(glyph_icon(icon_name, color, self.iconSize()))
+
 
 class SidebarButton(QPushButton):
     def __init__(self, text, icon_name, parent=None):
         super().__init__(parent)
         self.setText(text)
-        self.setIcon(qta.icon(icon_name, color="#e0e0e0"))
         self.setIconSize(QSize(20, 20))
+        self.setIcon(glyph_icon(icon_name, "#e0e0e0", self.iconSize()))
         self.setCursor(Qt.PointingHandCursor)
         self.setStyleSheet(
             "QPushButton { background-color: transparent; color: #e0e0e0; text-align: left; "
@@ -160,18 +2568,242 @@ class SidebarButton(QPushButton):
         )
 
 
-class ReorderableListWidget(QListWidget):
-    order_changed = pyqtSignal()
+# Parça listeleri için model. Satırlar parça sözlükleridir; ekleme, silme ve
+# taşıma görünüme tek satırlık rowsInserted/rowsRemoved/rowsMoved ile bildirilir.
+# Liste nesnesi paylaşılır: reset(lst) sonrası model doğrudan lst'yi değiştirir.
+# Kapaklar yalnızca görünüm load_thumbs ile istediğinde indirilir.
+class TrackListModel(QAbstractListModel):
+    row_moved = pyqtSignal(int, int)
+    MIME_TYPE = 'application/x-hypevibe-row'
+    MARKED_BRUSH = QBrush(QColor("#ff79c6"))
+
+    def __init__(self, tracks, placeholder, thumbs, group, thumb_size, reorderable=False, parent=None):
+        super().__init__(parent)
+        self.tracks = tracks
+        self.placeholder = placeholder
+        self.thumbs = thumbs
+        self.group = group
+        self.thumb_size = thumb_size
+        self.reorderable = reorderable
+        self.marked = None    # url -> bool; işaretli satırlar 💜 ile gösterilir
+        self.tooltip = None   # parça -> ipucu metni
+        self._icons = {}
+        self._pending = {}
+        self._flush_queued = False
+        self._key_rows = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.tracks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.tracks):
+            return None
+        track = self.tracks[index.row()]
+        if role == Qt.DisplayRole:
+            title = track.get('title', '')
+            return "💜 " + title if self.marked and self.marked(track.get('url')) else title
+        if role == Qt.DecorationRole:
+            return self._icons.get(track.get('thumbnail'), self.placeholder)
+        if role == Qt.ForegroundRole:
+            return self.MARKED_BRUSH if self.marked and self.marked(track.get('url')) else None
+        if role == Qt.ToolTipRole:
+            return self.tooltip(track) if self.tooltip else None
+        if role == Qt.UserRole:
+            return track
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.reorderable:
+            # Satırların üstüne değil, araya bırakılabilsin
+            flags |= Qt.ItemIsDragEnabled if index.isValid() else Qt.ItemIsDropEnabled
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes):
+        mime = QMimeData()
+        mime.setData(self.MIME_TYPE, ",".join(str(i.row()) for i in indexes).encode())
+        return mime
+
+    # QListView InternalMove bırakmayı moveRow ile yapar
+    def moveRows(self, src_parent, src, count, dst_parent, dst):
+        if src_parent.isValid() or dst_parent.isValid() or count != 1:
+            return False
+        if not self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dst):
+            return False
+        final = dst if dst < src else dst - 1
+        self.tracks.insert(final, self.tracks.pop(src))
+        self._key_rows = None
+        self.endMoveRows()
+        self.row_moved.emit(src, final)
+        return True
+
+    def reset(self, tracks):
+        self.thumbs.cancel_group(self.group)
+        self.beginResetModel()
+        self.tracks = tracks
+        self._icons.clear()
+        self._pending.clear()
+        self._key_rows = None
+        self.endResetModel()
+
+    def insert(self, row, track):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.tracks.insert(row, track)
+        if self._key_rows is not None and row == len(self.tracks) - 1:
+            self._key_rows.setdefault(track_key(track.get('url')), []).append(row)
+        else:
+            self._key_rows = None
+        self.endInsertRows()
+
+    def append(self, track):
+        self.insert(len(self.tracks), track)
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        track = self.tracks.pop(row)
+        self._key_rows = None
+        self.endRemoveRows()
+        return track
+
+    # tracks aynı sırayla gelen yeni tam liste; yalnızca urls'deki satırlar
+    # çıkarılıp yeni yerlerine eklenir, kaydırma konumu ve kapaklar korunur
+    def merge(self, tracks, urls):
+        for row in sorted({r for url in urls for r in self.rows_for(url)}, reverse=True):
+            self.remove(row)
+        keys = {track_key(url) for url in urls}
+        for row, track in enumerate(tracks):
+            if track_key(track.get('url')) in keys:
+                self.insert(row, track)
+
+    def rows_for(self, url):
+        if self._key_rows is None:
+            self._key_rows = {}
+            for row, track in enumerate(self.tracks):
+                self._key_rows.setdefault(track_key(track.get('url')), []).append(row)
+        return self._key_rows.get(track_key(url), ())
+
+    # İşaret ya da ipucu değişti; yalnızca o parçanın satırları yeniden çizilir
+    def refresh(self, url):
+        for row in self.rows_for(url):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    # Görünen satırlar ile bir sayfa altı/üstü için kapak ister. Öncelik ekrandaki
+    # sıraya göredir; aralık dışına düşen ve henüz başlamamış istekler bırakılır.
+    # Aralık dışındaki ikonlar da bırakılır: geri kaydırılınca ThumbnailCache'in
+    # bellek LRU'sundan gelir, model yalnızca pencere kadar kapak tutar.
+    def load_thumbs(self, first, last):
+        page = last - first + 1
+        wanted = {}
+        window = set()
+        for row in range(max(0, first - page), min(len(self.tracks), last + page + 1)):
+            url = self.tracks[row].get('thumbnail')
+            if not url:
+                continue
+            window.add(url)
+            if url not in self._icons and url not in wanted:
+                wanted[url] = row - first if row >= first else 2 * page + first - row
+        for url in [u for u in self._icons if u not in window]:
+            del self._icons[url]
+        for url, job in list(self._pending.items()):
+            if wanted.get(url) == job.priority or not self.thumbs.cancel(job):
+                wanted.pop(url, None)  # zaten sırada ya da iniyor
+            else:
+                del self._pending[url]
+        for url, priority in wanted.items():
+            job = self.thumbs.request(url, url, self._on_thumb, self.group, priority, self.thumb_size)
+            if job is not None:
+                self._pending[url] = job
+
+    def _on_thumb(self, url, pixmap):
+        self._pending.pop(url, None)
+        self._icons[url] = QIcon(pixmap)
+        # Aynı turda gelen kapaklar tek bir dataChanged ile çizilsin
+        if not self._flush_queued:
+            self._flush_queued = True
+            QTimer.singleShot(0, self._flush_icons)
+
+    def _flush_icons(self):
+        self._flush_queued = False
+        if self.tracks:
+            self.dataChanged.emit(self.index(0), self.index(len(self.tracks) - 1), [Qt.DecorationRole])
+
+
+class TrackListView(QListView):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setIconSize(QSize(*model.thumb_size))
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        if model.reorderable:
+            self.setDragDropMode(QAbstractItemView.InternalMove)
+            self.setDefaultDropAction(Qt.MoveAction)
+        # Kaydırma sırasında en fazla 40 ms'de bir görünen aralık yeniden hesaplanır
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.setInterval(40)
+        self._thumb_timer.timeout.connect(self.load_visible_thumbs)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_thumbs)
+        for signal in (model.rowsInserted, model.rowsRemoved, model.rowsMoved, model.modelReset):
+            signal.connect(self.schedule_thumbs)
+
+    def schedule_thumbs(self, *_):
+        if not self._thumb_timer.isActive():
+            self._thumb_timer.start()
+
+    def load_visible_thumbs(self):
+        model = self.model()
+        if not self.isVisible() or not model.rowCount():
+            return
+        rect = self.viewport().rect()
+        first = max(0, self.indexAt(QPoint(rect.center().x(), rect.top() + 4)).row())
+        row_height = max(1, self.visualRect(model.index(first)).height())
+        last = min(model.rowCount() - 1, first + rect.height() // row_height + 1)
+        model.load_thumbs(first, last)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_thumbs()
 
-    def dropEvent(self, event):
-        super().dropEvent(event)
-        self.order_changed.emit()
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_thumbs()
+
+    # Gizlenen sayfanın bekleyen kapak istekleri bırakılır
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.model().load_thumbs(0, -1)
 
 
 # --- 4. ANA UYGULAMA ---
-class HypeVibeNeon(QMainWindow):
-    media_finished = pyqtSignal()
+# Bir aramanın sayfalama durumu. live=False iken gelen sonuçlar buffer'da
+# bekler ve "daha fazla" istendiğinde bir anda listeye eklenir.
+class SearchSession:
+    def __init__(self, query, page_size, generation=0):
+        self.query = query
+        self.generation = generation
+        self.page_size = max(1, int(page_size))
+        self.next_start = 0
+        self.has_more = True
+        self.live = True
+        self.buffer = []
+        self.ticket = None
+        self.first_page = []
+        self.revalidation = None
+
+
+def format_time(ms):
+    return f"{ms // 60000:02}:{(ms // 1000) % 60:02}"
 
+
+class HypeVibeNeon(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -180,91 +2812,193 @@ class HypeVibeNeon(QMainWindow):
 
         self.default_volume = 80
 
-        # Veri Yükleme
-        self.queue = self.load_json("queue.json", [])
-        self.favorites = self.load_json("favs.json", [])
-        self.playlists = self.load_json("playlists.json", {})
-
-        # VLC - Video penceresini gizle, önbelleği artır
-        self.instance = None
-        self.player = None
-        try:
-            self.instance = vlc.Instance("--no-video --network-caching=10000 --quiet")
-            self.player = self.instance.media_player_new()
-            em = self.player.event_manager()
-            em.event_attach(vlc.EventType.MediaPlayerEndReached, self._on_vlc_end)
-            self.media_finished.connect(self.on_media_finished)
-        except Exception:
-            pass
+        # Veritabanı hemen açılır; listeler pencere göründükten sonra yüklenir (bkz. load_library)
+        with STARTUP.phase('veritabanı'):
+            self.store = PersistenceWorker(LIBRARY_DB_FILE, SETTINGS['persist_interval_ms'])
+            self.store.migrate_json("queue.json", "favs.json", "playlists.json")
+            self.library_search = LibrarySearch(LIBRARY_DB_FILE)
+        self.favorites = FavoritesIndex()
+        self.playlists = {}
+        self.library_loaded = False
+        prep_started = time.perf_counter()
+
+        self.engine = PlaybackEngine(SETTINGS['crossfade_ms'], SETTINGS['preload_seconds'], self)
+        self.engine.finished.connect(self.on_media_finished)
+        self.engine.advanced.connect(self.on_media_finished)
+        self.engine.failed.connect(self.on_media_failed)
 
         # State
         self.current_playlist = []
         self.current_index = -1
-        self.image_threads = []
+        self.thumb_cache = ThumbnailCache(
+            THUMB_CACHE_DIR,
+            SETTINGS['thumb_memory_mb'] * 1024 * 1024,
+            SETTINGS['thumb_disk_mb'] * 1024 * 1024,
+        )
+        self.thumbs = ThumbnailService(SETTINGS['thumb_workers'], self.thumb_cache, self)
+        self.queue_model = TrackListModel(
+            [], glyph_icon('fa5s.list', '#bd93f9', LIST_THUMB_SIZE),
+            self.thumbs, 'queue', LIST_THUMB_SIZE, True, self
+        )
+        self.favs_model = TrackListModel(
+            [], glyph_icon('fa5s.heart', '#bd93f9', LIST_THUMB_SIZE),
+            self.thumbs, 'favs', LIST_THUMB_SIZE, True, self
+        )
+        self.pl_model = TrackListModel(
+            [], glyph_icon('fa5s.music', '#f8f8f2', LIST_THUMB_SIZE), self.thumbs, 'playlist', LIST_THUMB_SIZE, True, self
+        )
+        self.results_model = TrackListModel(
+            [], glyph_icon('fa5s.music', '#bd93f9', THUMB_SIZE), self.thumbs, 'search', THUMB_SIZE, False, self
+        )
+        self.local_model = TrackListModel(
+            [], glyph_icon('fa5s.file-audio', '#bd93f9', LIST_THUMB_SIZE),
+            self.thumbs, 'local', LIST_THUMB_SIZE, False, self
+        )
+        self.scanner = None
+        self.lib_hits_model = TrackListModel(
+            [], glyph_icon('fa5s.music', '#bd93f9', LIST_THUMB_SIZE), self.thumbs, 'library', LIST_THUMB_SIZE, False, self
+        )
+        self.lib_hits_model.marked = self.is_in_favs
+        self.results_model.marked = self.is_in_favs
+        self.results_model.tooltip = self.track_tooltip
         self.old_pos = None
         self.current_data = None
         self.selected_playlist_name = None 
+        self.stream_cache = StreamUrlCache(
+            STREAM_CACHE_FILE, SETTINGS['stream_cache_margin'], SETTINGS['stream_cache_ttl']
+        )
+        self.played_from_cache = False
+        self.audio_cache = AudioCache(AUDIO_CACHE_DIR, SETTINGS['audio_cache_mb'] * 1024 * 1024)
+        self.played_local = False
+        self.waiting_for_prefetch = None
+        self.next_shuffle_index = None
+        self.resolver = ResolverPool(SETTINGS['resolver_workers'], self)
+        self.search = None
+        self.search_generation = 0
+        self.live_search = bool(SETTINGS['live_search'])
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.timeout.connect(self.do_search)
+        self.search_cache = SearchCache(
+            SEARCH_CACHE_FILE, SETTINGS['search_cache_ttl'],
+            SETTINGS['search_cache_max_age'], SETTINGS['search_cache_entries'],
+        )
+        self.stream_ticket = None
+        self.track_details = {}
+        self.enriching = None  # aynı anda tek zenginleştirme; çözülen video URL'si
+        self.hovered_url = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.timeout.connect(self.enrich_hovered_result)
+        self.prefetcher = StreamPrefetcher(self.resolver, self.stream_cache, self)
+        self.prefetcher.resolved.connect(self.on_prefetch_resolved)
+        self.downloads = DownloadManager(
+            self.audio_cache, self.resolver, self.stream_cache,
+            SETTINGS['download_workers'], SETTINGS['download_rate_kbps'],
+            DOWNLOADS_FILE, self.store.write_json, self,
+        )
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.run_prefetch)
 
         self.is_shuffle = False
         self.is_repeat = False
+        STARTUP.add('hazırlık', time.perf_counter() - prep_started)
 
-        self.init_ui()
-        self.init_style()
+        with STARTUP.phase('arayüz'):
+            self.init_ui()
+            self.init_style()
 
-        if self.player:
-            try:
-                self.player.audio_set_volume(self.default_volume)
-            except Exception:
-                pass
+        self.engine.set_volume(self.default_volume)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_slider)
-        self.timer.start(1000)
+        # Önbellekler çökmeye karşı arada bir de yazılsın
+        self.cache_timer = QTimer(self)
+        self.cache_timer.timeout.connect(self.save_caches)
+        self.cache_timer.start(60 * 1000)
 
-        self.refresh_queue_ui()
+        self.engine.position.connect(self.on_position)
 
-    # --- JSON Helper ---
-    def load_json(self, filename, default):
-        if os.path.exists(filename):
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                return default
-        return default
+        self.refresh_queue_ui()
 
-    def save_json(self, filename, data):
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-        except Exception:
-            pass
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.engine.set_position_updates(not self.isMinimized())
+        if not self.library_loaded:
+            self.library_loaded = True
+            QTimer.singleShot(0, self.load_library)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.engine.set_position_updates(False)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.engine.set_position_updates(self.isVisible() and not self.isMinimized())
+
+    # İlk kare çizildikten sonra kütüphane doldurulur, çözümleyici ısıtılır
+    def load_library(self):
+        shown_at = time.perf_counter()
+        with STARTUP.phase('veri'):
+            favorites = self.store.load('favorites')
+            self.favorites = FavoritesIndex(favorites)
+            if len(self.favorites) != len(favorites):
+                # Aynı videonun farklı adresleri tek kayda indi; depo da eşitlensin
+                # ki satır numarasıyla yapılan taşıma/silme doğru kayda gitsin
+                self.store.replace('favorites', list(self.favorites))
+            self.playlists = self.store.load_playlists()
+            self.favs_model.reset(list(self.favorites))
+            self.queue_model.reset(self.store.load('queue'))
+            self.local_model.reset(self.store.load_local())
+            self.refresh_playlists_ui()
+            self.refresh_queue_ui()
+            self.update_local_label()
+        STARTUP.report(shown_at)
+        self.resolver.warm()
+        self.start_scan()
 
     # --- Helper UI ---
-    def safe_set_item_icon(self, item, pixmap):
-        try:
-            if item is None: return
-            item.setIcon(QIcon(pixmap))
-        except RuntimeError: pass
-
     def safe_set_cover_pixmap(self, _item, pixmap):
         try:
-            self.lbl_cover.setPixmap(pixmap.scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            self.lbl_cover.setPixmap(pixmap)
         except RuntimeError: pass
 
-    # --- VLC Event ---
-    def _on_vlc_end(self, _event):
-        try: self.media_finished.emit()
-        except Exception: pass
+    def save_caches(self):
+        self.store.write_json(STREAM_CACHE_FILE, self.stream_cache.snapshot())
+        self.store.write_json(SEARCH_CACHE_FILE, self.search_cache.snapshot())
 
+    # --- Çalma motoru olayları ---
     def on_media_finished(self):
         self.play_next(auto=True)
 
+    def on_media_failed(self):
+        # Klasördeki dosya açılamadıysa çözümlenecek bir akış yok
+        if self.played_local and self.current_data and is_local_track(self.current_data.get('url')):
+            self.played_local = False
+            self.lbl_title.setText("Hata: dosya açılamadı")
+        # İndirilmiş dosya bozuksa sil, akıştan çal
+        elif self.played_local and self.current_data:
+            self.audio_cache.discard(self.current_data.get('url'))
+            self.played_local = False
+            self.resolve_stream(self.current_data)
+        # Önbellekten gelen adres reddedildiyse bir kez taze çözümle tekrar dene
+        elif self.played_from_cache and self.current_data:
+            self.stream_cache.invalidate(self.current_data.get('url'))
+            self.resolve_stream(self.current_data)
+
     # --- Kapanış ---
     def closeEvent(self, event):
-        self.save_json("favs.json", self.favorites)
-        self.save_json("queue.json", self.queue)
-        self.save_json("playlists.json", self.playlists)
+        if self.scanner is not None:
+            self.scanner.stop()
+            self.scanner.wait(5000)
+        self.thumbs.shutdown()
+        self.engine.shutdown()
+        self.prefetcher.stop()
+        self.downloads.stop()
+        self.resolver.shutdown()
+        self.save_caches()
+        self.library_search.close()
+        self.store.close()
         event.accept()
 
     # --- Style ---
@@ -273,10 +3007,10 @@ class HypeVibeNeon(QMainWindow):
             QMainWindow { background-color: transparent; }
             QFrame#MainFrame { background-color: #1e1e2e; border-radius: 15px; border: 1px solid #44475a; }
             QLineEdit { background-color: #282a36; color: #f8f8f2; border-radius: 20px; padding: 10px 15px; border: 1px solid #44475a; }
-            QListWidget { background-color: transparent; border: none; }
-            QListWidget::item { color: #f8f8f2; padding: 6px; margin: 2px; border-radius: 6px; }
-            QListWidget::item:hover { background-color: #44475a; }
-            QListWidget::item:selected { background-color: rgba(189, 147, 249, 0.2); color: #bd93f9; }
+            QListView { background-color: transparent; border: none; }
+            QListView::item { color: #f8f8f2; padding: 6px; margin: 2px; border-radius: 6px; }
+            QListView::item:hover { background-color: #44475a; }
+            QListView::item:selected { background-color: rgba(189, 147, 249, 0.2); color: #bd93f9; }
             QLabel { color: #f8f8f2; font-family: 'Segoe UI', Arial; }
             QSlider::groove:horizontal { height: 6px; background: #44475a; border-radius: 3px; }
             QSlider::handle:horizontal { background: #bd93f9; width: 14px; margin: -4px 0; border-radius: 7px; }
@@ -334,15 +3068,25 @@ class HypeVibeNeon(QMainWindow):
         self.btn_playlists = SidebarButton("  Playlistlerim", 'fa5s.list-alt')
         self.btn_playlists.clicked.connect(lambda: self.pages.setCurrentIndex(2))
 
+        self.btn_local = SidebarButton("  Yerel Müzik", 'fa5s.folder-open')
+        self.btn_local.clicked.connect(lambda: self.pages.setCurrentIndex(4))
+
         self.btn_queue = SidebarButton("  Sıradakiler (0)", 'fa5s.list')
         self.btn_queue.clicked.connect(lambda: self.pages.setCurrentIndex(3))
 
         sb.addWidget(self.btn_home)
         sb.addWidget(self.btn_lib)
         sb.addWidget(self.btn_playlists)
+        sb.addWidget(self.btn_local)
         sb.addWidget(self.btn_queue)
         sb.addStretch()
 
+        self.lbl_downloads = QLabel()
+        self.lbl_downloads.setStyleSheet("color: #6272a4; font-size: 12px; padding: 10px 20px; border: none;")
+        self.lbl_downloads.hide()
+        sb.addWidget(self.lbl_downloads)
+        self.downloads.progress.connect(self.update_download_status)
+
         # --- Page 0: Search ---
         p_search = QWidget()
         ls = QVBoxLayout(p_search)
@@ -352,42 +3096,89 @@ class HypeVibeNeon(QMainWindow):
         self.inp_search = QLineEdit()
         self.inp_search.setPlaceholderText("Şarkı ara... (Enter)")
         self.inp_search.returnPressed.connect(self.do_search)
+        self.inp_search.textEdited.connect(self.on_search_text_edited)
 
         btn_go = QPushButton()
-        btn_go.setIcon(qta.icon('fa5s.search', color='#1e1e2e'))
+        btn_go.setIcon(glyph_icon('fa5s.search', '#1e1e2e', btn_go.iconSize()))
         btn_go.setFixedSize(40, 40)
         btn_go.setStyleSheet("background-color: #bd93f9; border-radius: 20px;")
         btn_go.clicked.connect(self.do_search)
 
+        self.btn_live_search = QPushButton()
+        self.btn_live_search.setCheckable(True)
+        self.btn_live_search.setChecked(self.live_search)
+        self.btn_live_search.setFixedSize(40, 40)
+        self.btn_live_search.setToolTip("Yazarken ara")
+        self.btn_live_search.setCursor(Qt.PointingHandCursor)
+        self.btn_live_search.setStyleSheet(
+            "QPushButton { background-color: #282a36; border-radius: 20px; border: 1px solid #44475a; }"
+            "QPushButton:checked { border: 1px solid #bd93f9; }"
+        )
+        self.btn_live_search.toggled.connect(self.toggle_live_search)
+        self._set_live_search_icon()
+
         search_box.addWidget(self.inp_search)
+        search_box.addWidget(self.btn_live_search)
         search_box.addWidget(btn_go)
 
-        self.list_results = QListWidget()
-        self.list_results.setIconSize(QSize(120, 90))
-        self.list_results.itemDoubleClicked.connect(lambda item: self.play_item(item, 'search'))
+        self.list_results = TrackListView(self.results_model)
+        self.list_results.setMouseTracking(True)
+        self.list_results.entered.connect(self.on_result_hovered)
+        self.list_results.doubleClicked.connect(lambda index: self.play_item(index, self.results_model))
         self.list_results.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list_results.customContextMenuRequested.connect(lambda pos: self.show_generic_context_menu(pos, self.list_results))
 
+        self.list_results.verticalScrollBar().valueChanged.connect(self.on_results_scrolled)
+
+        self.lbl_results = QLabel("Sonuçlar:")
+        self.btn_more_results = QPushButton("⬇ Daha Fazla Yükle")
+        self.btn_more_results.setCursor(Qt.PointingHandCursor)
+        self.btn_more_results.setStyleSheet("background-color: #44475a; color: white; padding: 8px; border-radius: 10px;")
+        self.btn_more_results.clicked.connect(self.load_more_results)
+        self.btn_more_results.hide()
+
         ls.addLayout(search_box)
-        ls.addWidget(QLabel("Sonuçlar (5 Adet):"))
+        ls.addWidget(self.lbl_results)
         ls.addWidget(self.list_results)
+        ls.addWidget(self.btn_more_results)
 
         # --- Page 1: Library (Favs) ---
         p_lib = QWidget()
         ll = QVBoxLayout(p_lib)
         ll.setContentsMargins(30, 30, 30, 30)
 
-        self.list_favs = ReorderableListWidget()
-        self.list_favs.setIconSize(QSize(80, 60))
-        self.list_favs.setDragDropMode(QAbstractItemView.InternalMove)
-        self.list_favs.order_changed.connect(lambda: self.save_json("favs.json", self.get_list_data(self.list_favs)))
+        self.list_favs = TrackListView(self.favs_model)
+        self.favs_model.row_moved.connect(lambda src, dst: self.store.move('favorites', src, dst))
         self.list_favs.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list_favs.customContextMenuRequested.connect(lambda pos: self.show_generic_context_menu(pos, self.list_favs, is_fav=True))
-        self.list_favs.itemDoubleClicked.connect(lambda item: self.play_item(item, 'fav'))
-
-        ll.addWidget(QLabel("💜 Favorilerim (Sürükle & Sırala)"))
+        self.list_favs.doubleClicked.connect(lambda index: self.play_item(index, self.favs_model))
+
+        fav_top = QHBoxLayout()
+        btn_dl_favs = QPushButton("⬇ Çevrimdışı İndir")
+        btn_dl_favs.setCursor(Qt.PointingHandCursor)
+        btn_dl_favs.setStyleSheet("background-color: #44475a; color: white; padding: 8px; border-radius: 10px;")
+        btn_dl_favs.clicked.connect(lambda: self.download_tracks(self.favs_model.tracks))
+        self.lbl_favs = QLabel("💜 Favorilerim (Sürükle & Sırala)")
+        fav_top.addWidget(self.lbl_favs)
+        fav_top.addStretch()
+        fav_top.addWidget(btn_dl_favs)
+
+        # Tüm kütüphanede (favoriler, playlistler, sıra, yerel) anında filtre
+        self.inp_lib_search = QLineEdit()
+        self.inp_lib_search.setPlaceholderText("Kütüphanede ara... (favoriler, playlistler, sıra, yerel)")
+        self.inp_lib_search.setClearButtonEnabled(True)
+        self.inp_lib_search.textChanged.connect(self.filter_library)
+
+        self.list_lib_hits = TrackListView(self.lib_hits_model)
+        self.list_lib_hits.doubleClicked.connect(lambda index: self.play_item(index, self.lib_hits_model))
+        self.list_lib_hits.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_lib_hits.customContextMenuRequested.connect(lambda pos: self.show_generic_context_menu(pos, self.list_lib_hits))
+        self.list_lib_hits.hide()
+
+        ll.addWidget(self.inp_lib_search)
+        ll.addLayout(fav_top)
         ll.addWidget(self.list_favs)
-        self.load_favs_ui()
+        ll.addWidget(self.list_lib_hits)
 
         # --- Page 2: Playlists ---
         p_playlists = QWidget()
@@ -411,11 +3202,9 @@ class HypeVibeNeon(QMainWindow):
         self.list_pl_names.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list_pl_names.customContextMenuRequested.connect(self.show_playlist_names_menu)
 
-        self.list_pl_songs = ReorderableListWidget()
-        self.list_pl_songs.setIconSize(QSize(80, 60))
-        self.list_pl_songs.setDragDropMode(QAbstractItemView.InternalMove)
-        self.list_pl_songs.order_changed.connect(self.save_current_playlist_order)
-        self.list_pl_songs.itemDoubleClicked.connect(lambda item: self.play_item(item, 'playlist'))
+        self.list_pl_songs = TrackListView(self.pl_model)
+        self.pl_model.row_moved.connect(self.on_playlist_row_moved)
+        self.list_pl_songs.doubleClicked.connect(lambda index: self.play_item(index, self.pl_model))
         self.list_pl_songs.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list_pl_songs.customContextMenuRequested.connect(self.show_playlist_songs_menu)
 
@@ -447,13 +3236,11 @@ class HypeVibeNeon(QMainWindow):
         top_row.addStretch()
         top_row.addWidget(btn_clear_queue)
 
-        self.list_queue = ReorderableListWidget()
-        self.list_queue.setIconSize(QSize(80, 60))
-        self.list_queue.setDragDropMode(QAbstractItemView.InternalMove)
+        self.list_queue = TrackListView(self.queue_model)
         self.list_queue.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list_queue.customContextMenuRequested.connect(self.show_queue_context_menu)
-        self.list_queue.itemDoubleClicked.connect(self.play_queue_item)
-        self.list_queue.order_changed.connect(self.sync_queue_from_widget)
+        self.list_queue.doubleClicked.connect(self.play_queue_item)
+        self.queue_model.row_moved.connect(self.on_queue_row_moved)
 
         lq.addLayout(top_row)
         lq.addWidget(QLabel("📌 Sıradakiler (Sürükle & Sırala):"))
@@ -464,6 +3251,35 @@ class HypeVibeNeon(QMainWindow):
         self.pages.addWidget(p_playlists)
         self.pages.addWidget(p_queue)
 
+        # --- Page 4: Local ---
+        p_local = QWidget()
+        lo = QVBoxLayout(p_local)
+        lo.setContentsMargins(30, 30, 30, 30)
+
+        local_top = QHBoxLayout()
+        self.lbl_local = QLabel()
+        btn_add_folder = QPushButton("📁 Klasör Ekle")
+        btn_rescan = QPushButton("🔄 Yeniden Tara")
+        for b in (btn_add_folder, btn_rescan):
+            b.setCursor(Qt.PointingHandCursor)
+            b.setStyleSheet("background-color: #44475a; color: white; padding: 8px; border-radius: 10px;")
+        btn_add_folder.clicked.connect(self.add_music_folder)
+        btn_rescan.clicked.connect(self.start_scan)
+        local_top.addWidget(self.lbl_local)
+        local_top.addStretch()
+        local_top.addWidget(btn_add_folder)
+        local_top.addWidget(btn_rescan)
+
+        self.list_local = TrackListView(self.local_model)
+        self.list_local.doubleClicked.connect(lambda index: self.play_item(index, self.local_model))
+        self.list_local.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_local.customContextMenuRequested.connect(lambda pos: self.show_generic_context_menu(pos, self.list_local))
+
+        lo.addLayout(local_top)
+        lo.addWidget(self.list_local)
+        self.pages.addWidget(p_local)
+        self.update_local_label()
+
         content.addWidget(sidebar)
         content.addWidget(self.pages)
 
@@ -523,8 +3339,9 @@ class HypeVibeNeon(QMainWindow):
         seek = QHBoxLayout()
         self.lbl_curr = QLabel("00:00")
         self.slider = QSlider(Qt.Horizontal)
-        self.slider.setRange(0, 100)
+        self.slider.setRange(0, 0)  # Milisaniye; süre gelince kurulur
         self.slider.sliderReleased.connect(self.seek_audio)
+        self.slider.sliderMoved.connect(lambda ms: self.lbl_curr.setText(format_time(ms)))
         self.lbl_total = QLabel("00:00")
 
         seek.addWidget(self.lbl_curr)
@@ -543,6 +3360,7 @@ class HypeVibeNeon(QMainWindow):
 
         vol_row = QHBoxLayout()
         self.lbl_vol_icon = QLabel()
+        self.volume_glyph = None
         self._set_volume_icon(self.default_volume)
 
         self.slider_vol = QSlider(Qt.Horizontal)
@@ -582,55 +3400,69 @@ class HypeVibeNeon(QMainWindow):
 
     # --- Helpers ---
     def is_in_favs(self, url: str) -> bool:
-        return any((f.get('url') == url) for f in self.favorites)
+        return url in self.favorites
 
-    def get_list_data(self, list_widget):
-        data = []
-        for i in range(list_widget.count()):
-            data.append(list_widget.item(i).data(Qt.UserRole))
-        return data
+    def clear_results(self):
+        self.hovered_url = None
+        self.results_model.reset([])
 
     def update_search_marker_for_url(self, url: str):
-        is_fav = self.is_in_favs(url)
-        for i in range(self.list_results.count()):
-            it = self.list_results.item(i)
-            d = it.data(Qt.UserRole) or {}
-            if d.get("url") == url:
-                if is_fav:
-                    it.setForeground(QColor("#ff79c6"))
-                    if not it.text().startswith("💜 "):
-                        it.setText("💜 " + it.text())
-                else:
-                    it.setForeground(QColor("#f8f8f2"))
-                    it.setText(it.text().replace("💜 ", ""))
+        self.results_model.refresh(url)
+        self.lib_hits_model.refresh(url)
+
+    # --- Kütüphane Araması ---
+    def filter_library(self, text):
+        searching = bool(text.strip())
+        self.list_favs.setVisible(not searching)
+        self.list_lib_hits.setVisible(searching)
+        if not searching:
+            self.lib_hits_model.reset([])
+            self.lbl_favs.setText("💜 Favorilerim (Sürükle & Sırala)")
+            return
+        hits = self.library_search.search(text)
+        self.lib_hits_model.reset(hits)
+        more = '+' if len(hits) >= self.library_search.limit else ''
+        self.lbl_favs.setText(f"🔎 Kütüphanede {len(hits)}{more} sonuç")
 
     # --- Queue ---
     def add_to_queue(self, data: dict):
         if not data or not data.get('url'): return
-        self.queue.append(data)
-        self.save_json("queue.json", self.queue)
+        row = len(self.queue_model.tracks)
+        self.store.insert('queue', row, data)
+        self.queue_model.insert(row, data)
+        self.refresh_queue_ui()
+        self.schedule_prefetch()
+
+    def remove_from_queue(self, row):
+        data = self.queue_model.remove(row)
+        self.store.remove('queue', row)
         self.refresh_queue_ui()
+        self.schedule_prefetch()
+        return data
 
-    def sync_queue_from_widget(self):
-        self.queue = self.get_list_data(self.list_queue)
-        self.save_json("queue.json", self.queue)
-        self.btn_queue.setText(f"  Sıradakiler ({len(self.queue)})")
+    def on_queue_row_moved(self, src, dst):
+        self.store.move('queue', src, dst)
+        self.schedule_prefetch()
 
     def toggle_favorite_data(self, data: dict):
         if not data or not data.get('url'): return
         url = data['url']
 
-        if self.is_in_favs(url):
-            self.favorites = [f for f in self.favorites if f.get('url') != url]
+        removed = self.favorites.discard(url)
+        if removed:
+            # Satır video id dizininden bulunur; kayıt adresle silinir
+            for row in reversed(self.favs_model.rows_for(url)):
+                self.favs_model.remove(row)
+            self.store.remove_track('favorites', removed['url'])
         else:
-            self.favorites.append(data)
-        
-        self.save_json("favs.json", self.favorites)
-        self.load_favs_ui()
+            row = len(self.favs_model.tracks)
+            self.store.insert('favorites', row, data)
+            self.favorites.add(data)
+            self.favs_model.insert(row, data)
         
         if self.current_data and self.current_data.get('url') == url:
             is_fav = self.is_in_favs(url)
-            self.btn_like.setIcon(qta.icon('fa5s.heart', color='#ff5555' if is_fav else '#6272a4'))
+            self.btn_like.set_glyph('fa5s.heart', '#ff5555' if is_fav else '#6272a4')
         
         self.update_search_marker_for_url(url)
 
@@ -642,30 +3474,19 @@ class HypeVibeNeon(QMainWindow):
                 QMessageBox.warning(self, "Hata", "Bu isimde bir playlist zaten var.")
             else:
                 self.playlists[name] = []
-                self.save_json("playlists.json", self.playlists)
+                self.store.create_playlist(name)
                 self.refresh_playlists_ui()
 
     def refresh_playlists_ui(self):
         self.list_pl_names.clear()
         for name in self.playlists.keys():
             it = QListWidgetItem(name)
-            it.setIcon(qta.icon('fa5s.folder', color='#bd93f9'))
+            it.setIcon(glyph_icon('fa5s.folder', '#bd93f9'))
             self.list_pl_names.addItem(it)
 
     def load_playlist_songs_ui(self, item):
         self.selected_playlist_name = item.text()
-        self.list_pl_songs.clear()
-        songs = self.playlists.get(self.selected_playlist_name, [])
-        for s in songs:
-            it = QListWidgetItem(s.get('title', ''))
-            it.setIcon(qta.icon('fa5s.music', color='#f8f8f2'))
-            it.setData(Qt.UserRole, s)
-            self.list_pl_songs.addItem(it)
-            if s.get('thumbnail'):
-                d = ImageLoader(s['thumbnail'], it)
-                d.image_loaded.connect(self.safe_set_item_icon)
-                self.image_threads.append(d)
-                d.start()
+        self.pl_model.reset(self.playlists.get(self.selected_playlist_name, []))
 
     def add_to_playlist_dialog(self, data):
         if not self.playlists:
@@ -675,23 +3496,23 @@ class HypeVibeNeon(QMainWindow):
         names = list(self.playlists.keys())
         name, ok = QInputDialog.getItem(self, "Playlist Seç", "Şarkıyı hangi playliste ekleyelim?", names, 0, False)
         if ok and name:
-            self.playlists[name].append(data)
-            self.save_json("playlists.json", self.playlists)
-            QMessageBox.information(self, "Başarılı", f"Şarkı '{name}' listesine eklendi.")
+            row = len(self.playlists[name])
+            self.store.insert(('playlist', name), row, data)
             if self.selected_playlist_name == name:
-                self.load_playlist_songs_ui(self.list_pl_names.findItems(name, Qt.MatchExactly)[0])
+                self.pl_model.insert(row, data)
+            else:
+                self.playlists[name].append(data)
+            QMessageBox.information(self, "Başarılı", f"Şarkı '{name}' listesine eklendi.")
 
-    def save_current_playlist_order(self):
+    def on_playlist_row_moved(self, src, dst):
         if self.selected_playlist_name:
-            new_songs = self.get_list_data(self.list_pl_songs)
-            self.playlists[self.selected_playlist_name] = new_songs
-            self.save_json("playlists.json", self.playlists)
+            self.store.move(('playlist', self.selected_playlist_name), src, dst)
 
     # --- MENÜLER ---
-    def show_generic_context_menu(self, pos, list_widget, is_fav=False):
-        item = list_widget.itemAt(pos)
-        if not item: return
-        data = item.data(Qt.UserRole)
+    def show_generic_context_menu(self, pos, view, is_fav=False):
+        index = view.indexAt(pos)
+        if not index.isValid(): return
+        data = index.data(Qt.UserRole)
 
         menu = QMenu()
         act_queue = menu.addAction("➕ Queue’ya Ekle")
@@ -702,21 +3523,23 @@ class HypeVibeNeon(QMainWindow):
             menu.addSeparator()
             act_del = menu.addAction("🗑️ Listeden Kaldır")
 
-        action = menu.exec_(list_widget.mapToGlobal(pos))
+        action = menu.exec_(view.mapToGlobal(pos))
         if not action: return
 
         if action == act_queue: self.add_to_queue(data)
         elif action == act_pl: self.add_to_playlist_dialog(data)
         elif action == act_fav: self.toggle_favorite_data(data)
         elif is_fav and action == act_del:
-            row = list_widget.row(item)
-            list_widget.takeItem(row)
-            self.favorites = self.get_list_data(list_widget)
-            self.save_json("favs.json", self.favorites)
-            self.btn_like.setIcon(qta.icon('fa5s.heart', color='#6272a4'))
+            self.favs_model.remove(index.row())
+            self.store.remove_track('favorites', data.get('url'))
+            self.favorites.discard(data.get('url'))
+            if self.current_data and not self.is_in_favs(self.current_data.get('url')):
+                self.btn_like.set_glyph('fa5s.heart', '#6272a4')
+            self.update_search_marker_for_url(data.get('url'))
 
     def show_queue_context_menu(self, pos):
-        item = self.list_queue.itemAt(pos)
+        index = self.list_queue.indexAt(pos)
+        if not index.isValid(): return
         menu = QMenu()
         act_play = menu.addAction("▶️ Şimdi Çal")
         act_pl = menu.addAction("📂 Playlist'e Ekle...")
@@ -726,215 +3549,505 @@ class HypeVibeNeon(QMainWindow):
         if not action: return
 
         if action == act_pl:
-            self.add_to_playlist_dialog(item.data(Qt.UserRole))
+            self.add_to_playlist_dialog(index.data(Qt.UserRole))
         elif action == act_play:
-            self.play_queue_item(item)
+            self.play_queue_item(index)
         elif action == act_remove:
-            self.list_queue.takeItem(self.list_queue.row(item))
-            self.sync_queue_from_widget()
+            self.remove_from_queue(index.row())
 
     def show_playlist_names_menu(self, pos):
         item = self.list_pl_names.itemAt(pos)
         if not item: return
         menu = QMenu()
+        act_dl = menu.addAction("⬇ Çevrimdışı İndir")
         act_del = menu.addAction("🗑️ Playlisti Sil")
         action = menu.exec_(self.list_pl_names.mapToGlobal(pos))
-        if action == act_del:
+        if action == act_dl:
+            self.download_tracks(self.playlists.get(item.text(), []))
+        elif action == act_del:
             name = item.text()
             del self.playlists[name]
-            self.save_json("playlists.json", self.playlists)
+            self.store.delete_playlist(name)
             self.refresh_playlists_ui()
-            self.list_pl_songs.clear()
+            self.pl_model.reset([])
             self.selected_playlist_name = None
 
     def show_playlist_songs_menu(self, pos):
-        item = self.list_pl_songs.itemAt(pos)
-        if not item: return
+        index = self.list_pl_songs.indexAt(pos)
+        if not index.isValid(): return
         menu = QMenu()
         act_rem = menu.addAction("🗑️ Playlistten Çıkar")
         act_queue = menu.addAction("➕ Queue’ya Ekle")
         action = menu.exec_(self.list_pl_songs.mapToGlobal(pos))
         
         if action == act_rem:
-            self.list_pl_songs.takeItem(self.list_pl_songs.row(item))
-            self.save_current_playlist_order()
+            self.pl_model.remove(index.row())
+            self.store.remove(('playlist', self.selected_playlist_name), index.row())
         elif action == act_queue:
-            self.add_to_queue(item.data(Qt.UserRole))
+            self.add_to_queue(index.data(Qt.UserRole))
 
     # --- UI Refresh ---
+    # Yalnızca başlıkları günceller; satırlar modelden gelir
     def refresh_queue_ui(self):
-        self.btn_queue.setText(f"  Sıradakiler ({len(self.queue)})")
+        self.btn_queue.setText(f"  Sıradakiler ({len(self.queue_model.tracks)})")
         if self.current_data:
             self.lbl_nowplaying.setText(f"🎧 Şimdi Çalıyor: {self.current_data.get('title', '')[:50]}")
         else:
             self.lbl_nowplaying.setText("🎧 Şimdi Çalıyor: -")
 
-        self.list_queue.clear()
-        for s in self.queue:
-            it = QListWidgetItem(s.get('title', ''))
-            it.setIcon(qta.icon('fa5s.list', color='#bd93f9'))
-            it.setData(Qt.UserRole, s)
-            self.list_queue.addItem(it)
-            if s.get('thumbnail'):
-                d = ImageLoader(s['thumbnail'], it)
-                d.image_loaded.connect(self.safe_set_item_icon)
-                self.image_threads.append(d)
-                d.start()
-
-    def load_favs_ui(self):
-        self.list_favs.clear()
-        for s in self.favorites:
-            it = QListWidgetItem(s.get('title', ''))
-            it.setIcon(qta.icon('fa5s.heart', color='#bd93f9'))
-            it.setData(Qt.UserRole, s)
-            self.list_favs.addItem(it)
-            if s.get('thumbnail'):
-                d = ImageLoader(s['thumbnail'], it)
-                d.image_loaded.connect(self.safe_set_item_icon)
-                self.image_threads.append(d)
-                d.start()
+    # --- Yerel Müzik ---
+    def add_music_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Müzik Klasörü Seç")
+        if not folder or folder in SETTINGS['music_folders']: return
+        SETTINGS['music_folders'] = SETTINGS['music_folders'] + [folder]
+        user = load_user_settings()
+        user['music_folders'] = SETTINGS['music_folders']
+        self.store.write_json(SETTINGS_FILE, user)
+        self.start_scan()
+
+    def start_scan(self):
+        if not SETTINGS['music_folders']: return
+        if self.scanner is not None and self.scanner.isRunning(): return
+        self.scanner = LibraryScanner(self.store, SETTINGS['music_folders'], SETTINGS['scan_workers'], self)
+        self.scanner.scanned.connect(self.on_scan_finished)
+        self.lbl_local.setText("🎵 Yerel Müzik — taranıyor...")
+        self.scanner.start()
+
+    def on_scan_finished(self, stats):
+        if stats['tracks'] is not None:
+            # İlk tarama ya da toplu değişiklikte satır satır eklemek yavaş kalır
+            if not self.local_model.rowCount() or len(stats['dirty']) > LibraryScanner.BATCH:
+                self.local_model.reset(stats['tracks'])
+            else:
+                self.local_model.merge(stats['tracks'], stats['dirty'])
+        self.update_local_label(stats)
+
+    def update_local_label(self, stats=None):
+        text = f"🎵 Yerel Müzik ({self.local_model.rowCount()})"
+        if stats and (stats['changed'] or stats['removed']):
+            text += f" — {stats['changed']} güncellendi, {stats['removed']} kaldırıldı"
+        self.lbl_local.setText(text)
+
+    # --- İndirmeler ---
+    def download_tracks(self, tracks):
+        added = self.downloads.enqueue(list(tracks))
+        if not added:
+            QMessageBox.information(self, "Bilgi", "Bu listedeki şarkılar zaten indirilmiş ya da sırada.")
+
+    def update_download_status(self):
+        snap = self.downloads.snapshot()
+        if not snap['total']:
+            self.lbl_downloads.hide()
+            return
+        finished = snap['completed'] + snap['failed']
+        text = f"⬇ İndirme {finished}/{snap['total']}"
+        if snap['bytes_total']:
+            text += f" • %{100 * snap['bytes_done'] // snap['bytes_total']}"
+        self.lbl_downloads.setText(text)
+        lines = []
+        for title, done, total in snap['active']:
+            lines.append(f"{title[:40]} — %{100 * done // total}" if total else f"{title[:40]} — hazırlanıyor")
+        if snap['failed']: lines.append(f"{snap['failed']} parça indirilemedi")
+        self.lbl_downloads.setToolTip("\n".join(lines))
+        self.lbl_downloads.show()
 
     # --- MODLAR ---
     def toggle_shuffle(self):
         self.is_shuffle = not self.is_shuffle
         color = "#bd93f9" if self.is_shuffle else "#6272a4"
-        self.btn_shuffle.setIcon(qta.icon('fa5s.random', color=color))
+        self.btn_shuffle.set_glyph('fa5s.random', color)
+        self.next_shuffle_index = None
+        self.schedule_prefetch()
 
     def toggle_repeat(self):
         self.is_repeat = not self.is_repeat
         color = "#bd93f9" if self.is_repeat else "#6272a4"
-        self.btn_repeat.setIcon(qta.icon('fa5s.redo', color=color))
+        self.btn_repeat.set_glyph('fa5s.redo', color)
+        self.schedule_prefetch()
 
     def _set_volume_icon(self, v):
-        if v <= 0: icon = qta.icon('fa5s.volume-mute', color='#f8f8f2')
-        elif v <= 35: icon = qta.icon('fa5s.volume-down', color='#f8f8f2')
-        else: icon = qta.icon('fa5s.volume-up', color='#f8f8f2')
-        self.lbl_vol_icon.setPixmap(icon.pixmap(16, 16))
+        if v <= 0: name = 'fa5s.volume-mute'
+        elif v <= 35: name = 'fa5s.volume-down'
+        else: name = 'fa5s.volume-up'
+        # Kaydırıcı her adımda çağırır; simge değişmedikçe etikete dokunulmaz
+        if name == self.volume_glyph: return
+        self.volume_glyph = name
+        self.lbl_vol_icon.setPixmap(glyph_pixmap(name, '#f8f8f2', (16, 16)))
 
     def set_volume(self, v):
         self._set_volume_icon(v)
-        if self.player:
-            try: self.player.audio_set_volume(int(v))
-            except Exception: pass
+        self.engine.set_volume(v)
 
     # --- Search ---
     def do_search(self):
+        self.search_debounce.stop()
         q = self.inp_search.text().strip()
         if not q: return
-        self.list_results.clear()
-        self.lbl_title.setText("Aranıyor...")
-        self.search_thread = SearchThread(q)
-        self.search_thread.results_ready.connect(self.on_results)
-        self.search_thread.error_occurred.connect(lambda e: self.lbl_title.setText(f"Hata: {e}"))
-        self.search_thread.start()
+        if self.search and fold_text(q) == fold_text(self.search.query) and self.search.ticket is not None:
+            return  # Aynı sorgu zaten yolda
+        self.cancel_search_requests(self.search)
+        self.clear_results()
+        # Yeni nesil: eski aramalar işçide kesilir, geç gelen sonuçları çizilmez
+        self.search_generation = self.resolver.supersede('search')
+        self.search = SearchSession(q, SETTINGS['search_page_size'], self.search_generation)
+
+        cached = self.search_cache.get(q)
+        if cached:
+            results, has_more, fresh = cached
+            self.search.live = False
+            self.search.first_page = results
+            self.search.next_start = len(results)
+            self.search.has_more = has_more
+            self.on_results(results)
+            if not fresh:
+                self.revalidate_search(self.search)
+            elif has_more:
+                self.fetch_search_page(self.search)
+        else:
+            self.lbl_title.setText("Aranıyor...")
+            self.fetch_search_page(self.search)
+        self.update_results_footer()
+
+    def on_search_text_edited(self, text):
+        if not self.live_search: return
+        if len(text.strip()) < SETTINGS['live_search_min_chars']:
+            self.search_debounce.stop()
+            return
+        self.search_debounce.start(SETTINGS['live_search_debounce_ms'])
+
+    def toggle_live_search(self, checked):
+        self.live_search = checked
+        self._set_live_search_icon()
+        self.inp_search.setPlaceholderText("Yazmaya başla..." if checked else "Şarkı ara... (Enter)")
+        if not checked: self.search_debounce.stop()
+
+    def _set_live_search_icon(self):
+        color = "#bd93f9" if self.live_search else "#6272a4"
+        self.btn_live_search.setIcon(glyph_icon('fa5s.bolt', color, self.btn_live_search.iconSize()))
+
+    def cancel_search_requests(self, session):
+        if not session: return
+        if session.ticket is not None:
+            self.resolver.cancel(session.ticket)
+        if session.revalidation and session.revalidation.ticket is not None:
+            self.resolver.cancel(session.revalidation.ticket)
+
+    # Bayat önbellek gösterilirken ilk sayfa arka planda yeniden çekilir;
+    # sonuçlar değiştiyse liste sessizce yenisiyle değiştirilir
+    def revalidate_search(self, stale):
+        fresh = SearchSession(stale.query, stale.page_size, stale.generation)
+        fresh.live = False
+        stale.revalidation = fresh
+        fresh.ticket = self.resolver.submit(
+            self.search_request(fresh, 0),
+            lambda r: self.on_search_revalidated(stale, fresh, r),
+            fresh.buffer.append,
+        )
+
+    def on_search_revalidated(self, stale, fresh, response):
+        stale.revalidation = None
+        fresh.ticket = None
+        if not response.get('ok'): return
+        fresh.first_page = list(fresh.buffer)
+        fresh.next_start = response['data']['count']
+        fresh.has_more = response['data']['has_more']
+        self.search_cache.put(fresh.query, fresh.first_page, fresh.has_more)
+        if not self.is_current_search(stale): return
+
+        if [r.get('url') for r in fresh.first_page] == [r.get('url') for r in stale.first_page]:
+            if stale.ticket is None and not stale.buffer and stale.has_more:
+                self.fetch_search_page(stale)
+            return
+        if stale.ticket is not None:
+            self.resolver.cancel(stale.ticket)
+        self.search = fresh
+        self.clear_results()
+        buffered, fresh.buffer = fresh.buffer, []
+        self.on_results(buffered)
+        if fresh.has_more: self.fetch_search_page(fresh)
+        self.update_results_footer()
+
+    def search_request(self, session, start):
+        return {
+            'op': 'search', 'channel': 'search', 'generation': session.generation,
+            'query': session.query, 'start': start, 'count': session.page_size,
+        }
+
+    def is_current_search(self, session):
+        return session is self.search and session.generation == self.search_generation
+
+    def fetch_search_page(self, session):
+        session.ticket = self.resolver.submit(
+            self.search_request(session, session.next_start),
+            lambda r: self.on_search_page_done(session, r),
+            lambda e: self.on_search_item(session, e),
+        )
+
+    def on_search_item(self, session, entry):
+        if not self.is_current_search(session): return
+        if session.next_start == 0: session.first_page.append(entry)
+        if session.live: self.add_search_result(entry)
+        else: session.buffer.append(entry)
+
+    def on_search_page_done(self, session, response):
+        if not self.is_current_search(session): return
+        session.ticket = None
+        if not response.get('ok'):
+            session.has_more = False
+            if self.results_model.rowCount() == 0 and not session.buffer:
+                self.lbl_title.setText(f"Hata: {response.get('error')}")
+        else:
+            if session.next_start == 0:
+                self.search_cache.put(session.query, session.first_page, response['data']['has_more'])
+            session.next_start += response['data']['count']
+            session.has_more = response['data']['has_more']
+            if session.live:
+                session.live = False
+                # Sonraki sayfa şimdiden arka planda gelsin, "daha fazla" anında açılsın
+                if session.has_more: self.fetch_search_page(session)
+        self.update_results_footer()
+
+    def load_more_results(self):
+        session = self.search
+        if not session or session.live: return
+        buffered, session.buffer = session.buffer, []
+        for r in buffered:
+            self.add_search_result(r)
+        if session.ticket is not None:
+            # Sayfa hâlâ geliyor; kalan sonuçlar doğrudan listeye aksın
+            session.live = True
+        elif session.has_more:
+            session.live = not buffered
+            self.fetch_search_page(session)
+        self.update_results_footer()
+
+    def on_results_scrolled(self, value):
+        bar = self.list_results.verticalScrollBar()
+        if bar.maximum() > 0 and value >= bar.maximum() - 2:
+            self.load_more_results()
+
+    def update_results_footer(self):
+        session = self.search
+        self.lbl_results.setText(f"Sonuçlar ({self.results_model.rowCount()} Adet):")
+        can_load = bool(session) and not session.live and bool(session.buffer or session.ticket or session.has_more)
+        self.btn_more_results.setVisible(can_load)
 
     def on_results(self, res):
-        self.lbl_title.setText(f"{len(res)} Sonuç")
-        self.image_threads.clear()
         for r in res:
-            title = r.get('title') or r.get('id') or 'Bilinmiyor'
-            url = r.get('url') or r.get('webpage_url') or r.get('id')
-            thumbnail = r.get('thumbnail', '')
-            if not url: continue
-            if len(url) == 11 and '.' not in url: url = f"https://www.youtube.com/watch?v={url}"
-            
-            data = {'title': title, 'url': url, 'thumbnail': thumbnail}
-            it = QListWidgetItem(title)
-            it.setIcon(qta.icon('fa5s.music', color='#bd93f9'))
-            it.setData(Qt.UserRole, data)
-            self.list_results.addItem(it)
-            
-            if self.is_in_favs(url):
-                self.apply_fav_marker_to_search_item(it, True, title)
-
-            if thumbnail:
-                d = ImageLoader(thumbnail, it)
-                d.image_loaded.connect(self.safe_set_item_icon)
-                self.image_threads.append(d)
-                d.start()
+            self.add_search_result(r)
+
+    def add_search_result(self, r):
+        title = r.get('title') or r.get('id') or 'Bilinmiyor'
+        url = r.get('url') or r.get('webpage_url') or r.get('id')
+        thumbnail = r.get('thumbnail', '')
+        if not url: return
+        if len(url) == 11 and '.' not in url: url = f"https://www.youtube.com/watch?v={url}"
+
+        data = {'title': title, 'url': url, 'thumbnail': thumbnail}
+        if r.get('duration'): data['duration'] = r['duration']
+        if r.get('uploader'): data['uploader'] = r['uploader']
+        self.results_model.append(data)
+
+        count = self.results_model.rowCount()
+        self.lbl_title.setText(f"{count} Sonuç")
+        self.lbl_results.setText(f"Sonuçlar ({count} Adet):")
+
+    # --- Sonuç Zenginleştirme ---
+    def on_result_hovered(self, index):
+        self.hovered_url = index.data(Qt.UserRole).get('url')
+        self.hover_timer.start(350)
+
+    def enrich_hovered_result(self):
+        if self.hovered_url: self.enrich_track(self.hovered_url)
+
+    # Fare sonuçların üstünde gezerken havuz çıkarımlarla dolup çalma isteğini
+    # bekletmesin diye StreamPrefetcher gibi aynı anda tek istek yollanır; biten
+    # istekten sonra yalnızca o an üzerinde durulan satır çözülür.
+    def enrich_track(self, url):
+        if not url or url in self.track_details or self.enriching is not None: return
+        self.enriching = url
+        self.resolver.submit(
+            {'op': 'stream', 'url': url},
+            lambda r: self.on_track_enriched(url, r),
+        )
+
+    def on_track_enriched(self, url, response):
+        self.enriching = None
+        if response.get('ok'):
+            # Tam çıkarım akış adresini de verir; çalınırsa beklemeden başlasın
+            self.stream_cache.put(url, response['data']['stream_url'])
+            self.store_track_details(url, response['data']['details'])
+        # Beklerken başka satırın üstünde durulduysa sıra ona gelir
+        if self.hovered_url != url and not self.hover_timer.isActive():
+            self.enrich_hovered_result()
+
+    def store_track_details(self, url, details):
+        self.track_details[url] = details
+        self.results_model.refresh(url)
+        if self.current_data and self.current_data.get('url') == url and details.get('uploader'):
+            self.lbl_artist.setText(details['uploader'])
+
+    def track_tooltip(self, data):
+        details = self.track_details.get(data.get('url')) or data
+        lines = [details.get('title') or data.get('title', '')]
+        if details.get('uploader'): lines.append(f"👤 {details['uploader']}")
+        if details.get('duration'):
+            d = int(details['duration'])
+            lines.append(f"⏱ {d // 60:02}:{d % 60:02}")
+        if details.get('view_count'): lines.append(f"👁 {details['view_count']:,}".replace(",", "."))
+        return "\n".join(lines)
 
     # --- Play ---
-    def play_item(self, item, src):
-        if src == 'search':
-            self.current_playlist = self.get_list_data(self.list_results)
-            self.current_index = self.list_results.row(item)
-        elif src == 'fav':
-            self.current_playlist = self.get_list_data(self.list_favs)
-            self.current_index = self.list_favs.row(item)
-        elif src == 'playlist':
-            self.current_playlist = self.get_list_data(self.list_pl_songs)
-            self.current_index = self.list_pl_songs.row(item)
-
-        self.load_music(item.data(Qt.UserRole))
-
-    def play_queue_item(self, item):
-        row = self.list_queue.row(item)
-        if 0 <= row < len(self.queue):
-            data = self.queue.pop(row)
-            self.save_json("queue.json", self.queue)
-            self.refresh_queue_ui()
-            self.load_music(data)
+    def play_item(self, index, model):
+        self.current_playlist = list(model.tracks)
+        self.current_index = index.row()
+        self.load_music(model.tracks[index.row()])
+
+    def play_queue_item(self, index):
+        if index.isValid():
+            self.load_music(self.remove_from_queue(index.row()))
 
     def load_music(self, data):
         self.current_data = data
+        self.waiting_for_prefetch = None
         self.lbl_title.setText("Yükleniyor...")
-        self.lbl_artist.setText(data.get('title', ''))
+        details = self.track_details.get(data.get('url')) or data
+        self.lbl_artist.setText(details.get('uploader') or data.get('title', ''))
         
         is_fav = self.is_in_favs(data.get('url', ''))
-        self.btn_like.setIcon(qta.icon('fa5s.heart', color='#ff5555' if is_fav else '#6272a4'))
+        self.btn_like.set_glyph('fa5s.heart', '#ff5555' if is_fav else '#6272a4')
         self.refresh_queue_ui()
 
-        if not self.instance or not self.player: return
-        
-        self.audio_thread = AudioThread(data['url'], data.get('title', ''))
-        self.audio_thread.url_ready.connect(self.start_vlc)
-        self.audio_thread.error_occurred.connect(lambda e: QMessageBox.warning(self, "Bağlantı Hatası", f"{e}"))
-        self.audio_thread.start()
-
-    def start_vlc(self, url, title):
-        if not self.player: return
-        m = self.instance.media_new(url)
-        self.player.set_media(m)
-        self.player.play()
+        if not self.engine.available: return
+
+        # Yerel dosya ya da indirilmiş parça: çözümleme ve ağ tamponu yok
+        local = data['url'] if is_local_track(data['url']) else self.audio_cache.path(data['url'])
+        self.played_local = bool(local)
+        if local:
+            if local != data['url']:
+                self.audio_cache.touch(data['url'])
+            self.start_playback(local, data.get('title', ''))
+            return
+
+        cached = self.stream_cache.get(data['url'])
+        if cached:
+            self.played_from_cache = True
+            self.start_playback(cached, data.get('title', ''))
+            return
+        if self.prefetcher.is_resolving(data['url']):
+            # Ön çözümleme zaten bu şarkı üzerinde, sonucunu bekle
+            self.waiting_for_prefetch = data['url']
+            return
+        self.resolve_stream(data)
+
+    def resolve_stream(self, data):
+        self.played_from_cache = False
+        video_url = data['url']
+        title = data.get('title', '')
+        if self.stream_ticket is not None:
+            self.resolver.cancel(self.stream_ticket)
+        self.stream_ticket = self.resolver.submit(
+            {'op': 'stream', 'url': video_url},
+            lambda r: self.on_stream_resolved(video_url, title, r),
+        )
+
+    def on_stream_resolved(self, video_url, title, response):
+        self.stream_ticket = None
+        if not response.get('ok'):
+            QMessageBox.warning(self, "Bağlantı Hatası", f"{response.get('error')}")
+            return
+        stream_url = response['data']['stream_url']
+        self.stream_cache.put(video_url, stream_url)
+        self.store_track_details(video_url, response['data']['details'])
+        # Bu arada başka bir şarkıya geçildiyse eski sonucu çalma
+        if self.current_data and self.current_data.get('url') == video_url:
+            self.start_playback(stream_url, title)
+
+    def start_playback(self, url, title):
+        if not self.engine.available: return
+        self.engine.play(url)
         self.lbl_title.setText(title[:40])
-        self.btn_play.setIcon(qta.icon('fa5s.pause-circle', color='#bd93f9'))
+        self.btn_play.set_glyph('fa5s.pause-circle', '#bd93f9')
         
+        self.thumbs.cancel_group('cover')
         if self.current_data and self.current_data.get('thumbnail'):
-            d = ImageLoader(self.current_data['thumbnail'], None)
-            d.image_loaded.connect(self.safe_set_cover_pixmap)
-            self.image_threads.append(d)
-            d.start()
+            # Çalan şarkının kapağı listelerden önce gelsin
+            self.thumbs.request(self.current_data['thumbnail'], None, self.safe_set_cover_pixmap, 'cover', -1, COVER_SIZE)
+
+        if not self.played_local and self.current_data and SETTINGS['audio_cache_on_play']:
+            self.downloads.save(self.current_data, url)
+
+        self.schedule_prefetch()
 
     def toggle_play(self):
-        if not self.player: return
-        if self.player.is_playing():
-            self.player.pause()
-            self.btn_play.setIcon(qta.icon('fa5s.play-circle', color='#bd93f9'))
+        if not self.engine.available: return
+        if self.engine.is_playing():
+            self.engine.pause()
+            self.btn_play.set_glyph('fa5s.play-circle', '#bd93f9')
         else:
-            self.player.play()
-            self.btn_play.setIcon(qta.icon('fa5s.pause-circle', color='#bd93f9'))
+            self.engine.resume()
+            self.btn_play.set_glyph('fa5s.pause-circle', '#bd93f9')
 
     def play_next(self, auto=False):
-        if self.queue:
-            nxt = self.queue.pop(0)
-            self.save_json("queue.json", self.queue)
-            self.refresh_queue_ui()
-            self.load_music(nxt)
+        if self.queue_model.tracks:
+            self.load_music(self.remove_from_queue(0))
             return
 
-        if not self.current_playlist: return
-
-        if self.is_shuffle:
-            self.current_index = random.randint(0, len(self.current_playlist) - 1)
-        else:
-            if self.current_index < len(self.current_playlist) - 1:
-                self.current_index += 1
-            else:
-                if self.is_repeat: self.current_index = 0
-                else: return
+        nxt = self.peek_playlist_index()
+        if nxt is None: return
+        self.current_index = nxt
+        self.next_shuffle_index = None
 
         self.load_music(self.current_playlist[self.current_index])
 
+    # Shuffle'da sıradaki indeks önceden seçilir ki ön çözümleme aynı şarkıyı hazırlasın
+    def peek_playlist_index(self):
+        if not self.current_playlist: return None
+        if self.is_shuffle:
+            if self.next_shuffle_index is None or self.next_shuffle_index >= len(self.current_playlist):
+                self.next_shuffle_index = random.randint(0, len(self.current_playlist) - 1)
+            return self.next_shuffle_index
+        if self.current_index < len(self.current_playlist) - 1:
+            return self.current_index + 1
+        if self.is_repeat: return 0
+        return None
+
+    def upcoming_tracks(self):
+        tracks = self.queue_model.tracks[:SETTINGS['prefetch_queue']]
+        nxt = self.peek_playlist_index()
+        if nxt is not None:
+            tracks.append(self.current_playlist[nxt])
+        return tracks
+
+    def schedule_prefetch(self):
+        if self.engine.available:
+            self.prefetch_timer.start(SETTINGS['prefetch_delay_ms'])
+
+    def run_prefetch(self):
+        self.prefetcher.set_targets([
+            t.get('url') for t in self.upcoming_tracks()
+            if not is_local_track(t.get('url')) and not self.audio_cache.has(t.get('url'))
+        ])
+        self.preload_next()
+
+    # Sıradaki parçanın hemen çalınabilir adresi varsa motor bitişe yakın açıp tamponlar
+    def preload_next(self):
+        upcoming = self.upcoming_tracks()
+        url = upcoming[0].get('url') if upcoming else None
+        if url and not is_local_track(url):
+            url = self.audio_cache.path(url) or self.stream_cache.get(url)
+        self.engine.preload(url)
+
+    def on_prefetch_resolved(self, video_url, result):
+        self.track_details[video_url] = result['details']
+        self.preload_next()
+        if self.waiting_for_prefetch != video_url: return
+        self.waiting_for_prefetch = None
+        if self.current_data and self.current_data.get('url') == video_url:
+            self.played_from_cache = True
+            self.store_track_details(video_url, result['details'])
+            self.start_playback(result['stream_url'], self.current_data.get('title', ''))
+
     def play_prev(self):
         if not self.current_playlist: return
         if self.current_index > 0:
@@ -942,29 +4055,30 @@ class HypeVibeNeon(QMainWindow):
             self.load_music(self.current_playlist[self.current_index])
 
     def seek_audio(self):
-        if not self.player: return
-        length = self.player.get_length()
-        if length > 0: self.player.set_time(int(length * (self.slider.value() / 100)))
-
-    def update_slider(self):
-        if not self.player or not self.player.is_playing(): return
-        l = self.player.get_length()
-        c = self.player.get_time()
-        if l > 0:
-            self.slider.setValue(int((c / l) * 100))
-            self.lbl_curr.setText(f"{c // 60000:02}:{(c // 1000) % 60:02}")
-            self.lbl_total.setText(f"{l // 60000:02}:{(l // 1000) % 60:02}")
+        if self.engine.length() > 0: self.engine.set_time(self.slider.value())
+
+    def on_position(self, ms, length):
+        if length > 0 and self.slider.maximum() != length:
+            self.slider.setRange(0, length)
+            self.lbl_total.setText(format_time(length))
+            # Kaydırıcının bir pikselinden kısa adımlar gösterilmez
+            self.engine.position_interval = max(50, min(1000, length // max(1, self.slider.width())))
+        if self.slider.isSliderDown(): return
+        self.slider.setValue(max(0, ms))
+        self.lbl_curr.setText(format_time(max(0, ms)))
 
     def add_fav(self):
         if self.current_data: self.toggle_favorite_data(self.current_data)
 
     def clear_queue(self):
-        self.queue = []
-        self.save_json("queue.json", self.queue)
+        self.queue_model.reset([])
+        self.store.clear('queue')
         self.refresh_queue_ui()
+        self.schedule_prefetch()
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = HypeVibeNeon()
     window.show()